@@ -1,21 +1,42 @@
-from aqt import mw
+import time
+_startup_began = time.perf_counter()
+
+import importlib
+import sys
+from aqt import mw, gui_hooks
 from aqt.qt import QAction, QMenu
-from .main import FocumonWindow
-from .settings import SettingsDialog
-from . import deck_widget  # Import to register deck browser widget hooks
-from .reload_utils import reload_modules
+from . import instrumentation
+
+# Everything else is imported on first use through load_module(), so loading
+# the add-on at Anki launch only builds the menu and registers hooks. Each
+# deferred import is recorded as an "import.<module>" timing.
+
+def load_module(name):
+    """Import .name on first use and return it, timing the import."""
+    full_name = f"{__name__}.{name}"
+    module = sys.modules.get(full_name)
+    if module is None:
+        before = set(sys.modules)
+        started = time.perf_counter()
+        module = importlib.import_module(full_name)
+        loaded = sorted(m.rsplit('.', 1)[-1] for m in set(sys.modules) - before if m.startswith(f"{__name__}."))
+        instrumentation.record(f"import.{name}", time.perf_counter() - started, modules=loaded)
+    return module
+
+def get_config():
+    return mw.addonManager.getConfig(__name__) or {}
 
 def show_focumon():
     if not hasattr(mw, "focumon_window"):
-        mw.focumon_window = FocumonWindow(mw)
+        # Imported on first use so the browser window is only built when opened
+        mw.focumon_window = load_module("main").FocumonWindow(mw)
     mw.focumon_window.show()
     mw.focumon_window.activateWindow()
 
 def show_settings():
-    d = SettingsDialog(mw)
+    d = load_module("settings").SettingsDialog(mw)
     if d.exec():
-        from .deck_widget import reset_cache
-        reset_cache()
+        load_module("deck_widget").apply_settings()
         if mw.state == "deckBrowser":
             mw.deckBrowser.refresh()
 
@@ -32,26 +53,29 @@ settings_action.triggered.connect(show_settings)
 focumon_menu.addAction(settings_action)
 
 def sync_focumon_stats():
-    if not hasattr(mw, "focumon_window"):
-        mw.focumon_window = FocumonWindow(mw)
-    # Ensure window is created so the webview exists
-    # If hidden, that's fine, we just need the instance
-    mw.focumon_window.sync_stats()
+    # Stats only need HTTP, so the Focumon window is not constructed here
+    load_module("profile_sync").sync_stats(mw)
 
 sync_action = QAction("Profile", mw)
 sync_action.triggered.connect(sync_focumon_stats)
 focumon_menu.addAction(sync_action)
 
+def show_timings():
+    load_module("timings_dialog").TimingsDialog(mw).exec()
+
+timings_action = QAction("Timings", mw)
+timings_action.triggered.connect(show_timings)
+focumon_menu.addAction(timings_action)
+
 # Add separator and reload action for development
 focumon_menu.addSeparator()
 reload_action = QAction("Refresh", mw)
-reload_action.triggered.connect(reload_modules)
+reload_action.triggered.connect(lambda: load_module("reload_utils").reload_modules())
 focumon_menu.addAction(reload_action)
 
 def show_instructions():
-    from .instructions_dialog import InstructionsDialog
     if not hasattr(mw, "instructions_dialog") or not mw.instructions_dialog:
-        mw.instructions_dialog = InstructionsDialog(mw)
+        mw.instructions_dialog = load_module("instructions_dialog").InstructionsDialog(mw)
     mw.instructions_dialog.show()
     mw.instructions_dialog.activateWindow()
     mw.instructions_dialog.raise_()
@@ -61,20 +85,42 @@ instr_action.triggered.connect(show_instructions)
 focumon_menu.insertAction(settings_action, instr_action)
 
 def check_welcome_screen():
-    config = mw.addonManager.getConfig(__name__)
-    if config is None:
-        config = {}
-    
+    config = get_config()
+
     # Default true if not set
     if config.get("show_welcome", True):
         # We need to show the welcome screen
         # Use a timer to ensure main window is visible/ready
-        from .welcome_dialog import WelcomeDialog
         if not hasattr(mw, "welcome_dialog") or not mw.welcome_dialog:
-            mw.welcome_dialog = WelcomeDialog(mw)
+            mw.welcome_dialog = load_module("welcome_dialog").WelcomeDialog(mw)
         mw.welcome_dialog.show()
         mw.welcome_dialog.activateWindow()
         mw.welcome_dialog.raise_()
 
-from aqt import gui_hooks
-gui_hooks.profile_did_open.append(check_welcome_screen)
\ No newline at end of file
+def add_deck_widget(deck_browser, content):
+    # The widget module (and the HTTP stack behind it) loads on the first
+    # deck browser render, and not at all while the widget is hidden
+    if get_config().get("hide_deck_widget", False):
+        return
+    load_module("deck_widget").add_widget_to_deck_browser(deck_browser, content)
+
+def prefetch_profiles():
+    if get_config().get("per_profile_username", False):
+        load_module("deck_widget").prefetch_profiles()
+
+def on_config_updated(config):
+    # Edits made in Anki's config editor (e.g. poll_interval_minutes); the
+    # widget only needs telling if it has been loaded
+    if f"{__name__}.deck_widget" in sys.modules:
+        load_module("deck_widget").apply_settings()
+    if mw.state == "deckBrowser":
+        mw.deckBrowser.refresh()
+
+mw.addonManager.setConfigUpdatedAction(__name__, on_config_updated)
+
+gui_hooks.profile_did_open.append(check_welcome_screen)
+gui_hooks.profile_did_open.append(prefetch_profiles)
+gui_hooks.deck_browser_will_render_content.append(add_deck_widget)
+
+instrumentation.record("startup", time.perf_counter() - _startup_began,
+                       modules=sorted(m.rsplit('.', 1)[-1] for m in sys.modules if m.startswith(f"{__name__}.")))
@@ -0,0 +1,59 @@
+// Focumon deck browser widget: in-place updates.
+// focumonWidget.update(data) patches only the nodes whose content changed and
+// returns false when the widget's structure doesn't match, in which case the
+// caller swaps in freshly rendered markup instead.
+window.focumonWidget = {
+    update: function (data) {
+        var root = document.getElementById("focumon-widget");
+        if (!root || root.getAttribute("data-state") !== "stats") {
+            return false;
+        }
+
+        // Every field must either have a node to patch or be absent on both sides
+        var fields = [
+            [".widget-username", "text", data.username],
+            ["[data-field='level']", "text", data.level],
+            ["[data-field='focudex']", "text", data.focudex],
+            [".sprite.trainer", "src", data.trainer_sprite],
+            [".sprite.focumon", "src", data.focumon_sprite]
+        ];
+        var nodes = [];
+        for (var i = 0; i < fields.length; i++) {
+            var node = root.querySelector(fields[i][0]);
+            if (!node !== (fields[i][2] == null)) {
+                return false;
+            }
+            nodes.push(node);
+        }
+
+        for (var j = 0; j < fields.length; j++) {
+            var el = nodes[j];
+            var value = fields[j][2];
+            if (!el) {
+                continue;
+            }
+            if (fields[j][1] === "src") {
+                if (el.getAttribute("src") !== value) {
+                    el.setAttribute("src", value);
+                }
+            } else if (el.textContent !== value) {
+                el.textContent = value;
+            }
+        }
+
+        if (root.classList.contains("stale") !== !!data.stale) {
+            root.classList.toggle("stale", !!data.stale);
+            if (data.stale) {
+                root.setAttribute("title", "Offline: showing last known stats");
+            } else {
+                root.removeAttribute("title");
+            }
+        }
+
+        var link = document.getElementById("focumon-widget-css");
+        if (link && data.css && link.getAttribute("href") !== data.css) {
+            link.setAttribute("href", data.css);
+        }
+        return true;
+    }
+};
@@ -0,0 +1,92 @@
+"""
+Cache Janitor for Focumon Add-on
+Deletes browser cache folders without blocking the UI: each folder is renamed
+out of the way (cheap and atomic on the same filesystem) and the renamed copy
+is removed on a background thread.
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+
+TRASH_SUFFIX = ".focumon-trash"
+
+
+def _folder_size(path):
+    """Total size in bytes of the files under path."""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _delete(paths):
+    started = time.monotonic()
+    freed = 0
+    for path in paths:
+        freed += _folder_size(path)
+        try:
+            shutil.rmtree(path)
+        except Exception as e:
+            print(f"Failed to clean cache: {e}")
+
+    elapsed = time.monotonic() - started
+    print(f"Focumon: removed {len(paths)} cache folder(s), "
+          f"{freed / (1024 * 1024):.1f} MB in {elapsed:.2f}s")
+
+
+def move_to_trash(path):
+    """
+    Rename a folder to a unique trash name next to it.
+    Returns the new path, or None if there was nothing to move.
+    """
+    if not os.path.exists(path):
+        return None
+
+    trash_path = f"{path.rstrip(os.sep)}.{uuid.uuid4().hex[:8]}{TRASH_SUFFIX}"
+    try:
+        os.replace(path, trash_path)
+    except OSError as e:
+        print(f"Failed to clean cache: {e}")
+        return None
+    return trash_path
+
+
+def find_leftovers(parent):
+    """Trash folders from earlier sessions that were not fully deleted."""
+    try:
+        names = os.listdir(parent)
+    except OSError:
+        return []
+    return [os.path.join(parent, name) for name in names if name.endswith(TRASH_SUFFIX)]
+
+
+def cleanup(paths):
+    """
+    Move each folder in paths out of the way and delete them in the background.
+    Returns as soon as the renames are done; the caller can immediately reuse the
+    original paths.
+    """
+    trash = []
+    parents = set()
+    for path in paths:
+        parents.add(os.path.dirname(path.rstrip(os.sep)))
+        trash_path = move_to_trash(path)
+        if trash_path:
+            trash.append(trash_path)
+
+    for parent in parents:
+        for leftover in find_leftovers(parent):
+            if leftover not in trash:
+                trash.append(leftover)
+
+    if trash:
+        threading.Thread(
+            target=_delete, args=(trash,), name="focumon-cache-janitor", daemon=True
+        ).start()
@@ -4,20 +4,72 @@ Displays a 200px by 200px widget with Focumon stats on the deck browser.
 """
 
 from aqt import mw, gui_hooks
+from aqt.qt import QTimer
 import aqt.deckbrowser
-from . import scrapers
-import urllib.request
-import urllib.error
+from . import http_client
+from . import stats_cache
+from . import stats_service
+from . import sprite_store
+from . import instrumentation
+from .refresh_scheduler import RefreshScheduler, DEFAULT_MIN_INTERVAL
+from .stats_poller import StatsPoller
+import os
+import json
 
-# Cache for the widget HTML
-cached_html = None
+# Widget assets are served to the deck browser webview through Anki's add-on
+# web exports, so the page references them by URL and the webview caches them
+WEB_EXPORTS = r"(assets/.*\.(ttf|svg|js)|focumon_fam\.png|user_files/(sprites|css)/.*\.(png|css))"
+mw.addonManager.setWebExports(__name__, WEB_EXPORTS)
+WEB_BASE = f"/_addons/{mw.addonManager.addonFromModule(__name__)}/"
 
+CSS_DIR = os.path.join(os.path.dirname(__file__), "user_files", "css")
+
+# Stylesheet text -> URL of the file it was written to
+stylesheet_urls = {}
+
+# Two-level widget cache:
+#   1. the stats model (what was fetched or loaded from disk, and for whom)
+#   2. the markup rendered from it, keyed by (stats, theme, loading); ProfileStats
+#      hashes cheaply, so unchanged stats always hit this cache
+# Theme and visibility changes only touch level 2 and never do I/O.
+current_stats = None
+stats_username = None
+stats_valid = False
+rendered_html = {}
+
+# Rendered markup entries kept before the oldest is dropped
+MAX_RENDERED = 8
+
+# Background refresh bookkeeping
+refresh_in_flight = False
+cache_generation = 0
+
+# Set when the cache is invalidated and cleared by the next successful fetch;
+# while it is clear, a fresh on-disk entry is trusted without going to the network
+needs_refetch = False
+
+# Compiled widget stylesheets keyed by theme -> (font-face CSS, stylesheet)
+css_cache = {}
+
+def get_theme():
+    is_dark = mw.pm.night_mode() if hasattr(mw.pm, 'night_mode') else False
+    return "dark" if is_dark else "light"
+
+@instrumentation.timed("deck_widget.generate_css")
 def generate_css():
-    """Generate CSS for the Focumon widget."""
+    """Generate CSS for the Focumon widget, compiled once per theme."""
     from . import font_utils
     
     # Detect theme
-    is_dark = mw.pm.night_mode() if hasattr(mw.pm, 'night_mode') else False
+    theme = get_theme()
+    is_dark = theme == "dark"
+    
+    # Get font-face CSS (cached by font_utils until a font file changes)
+    font_face = font_utils.get_font_face_css(WEB_BASE)
+    
+    cached = css_cache.get(theme)
+    if cached and cached[0] == font_face:
+        return cached[1]
     
     # Color scheme
     bg_color = "#242424" if is_dark else "#FAF8F2"
@@ -25,10 +77,7 @@ def generate_css():
     accent_color = "#FFDD19"
     stat_bg = "#202020" if is_dark else "#E3E2DC"
     
-    # Get font-face CSS
-    font_face = font_utils.get_font_face_css()
-    
-    return f"""
+    css = f"""
         {font_face}
         
         #focumon-widget-container {{
@@ -135,6 +184,11 @@ def generate_css():
             border-radius: 8px;
         }}
         
+        #focumon-widget.stale .sprites-container,
+        #focumon-widget.stale .widget-content {{
+            opacity: 0.6;
+        }}
+
         #focumon-widget .no-stats {{
             font-size: 12px;
             text-align: center;
@@ -170,50 +224,72 @@ def generate_css():
             opacity: 1;
         }}
 
-        #focumon-widget .icon-btn svg {{
+        #focumon-widget .icon-btn .icon {{
             width: 100%;
             height: 100%;
-            fill: currentColor;
+            background-color: currentColor;
+            -webkit-mask-position: center;
+            -webkit-mask-size: contain;
+            -webkit-mask-repeat: no-repeat;
+        }}
+
+        #focumon-widget .icon-gear {{
+            -webkit-mask-image: url('{WEB_BASE}assets/gear.svg');
+        }}
+
+        #focumon-widget .icon-refresh {{
+            -webkit-mask-image: url('{WEB_BASE}assets/refresh.svg');
+        }}
+
+        #focumon-widget .icon-gamepad {{
+            -webkit-mask-image: url('{WEB_BASE}assets/gamepad.svg');
         }}
     """
+    css_cache[theme] = (font_face, css)
+    return css
 
-def generate_html(stats_data=None):
-    """Generate HTML for the Focumon widget."""
-    
-    # Top Buttons (Settings, Refresh, & Open)
-    gear_svg = get_svg_content("gear.svg")
-    refresh_svg = get_svg_content("refresh.svg")
-    gamepad_svg = get_svg_content("gamepad.svg")
+@instrumentation.timed("deck_widget.generate_html")
+def generate_html(stats=None, loading=False):
+    """Generate HTML for the Focumon widget from a ProfileStats."""
     
-    buttons_html = f"""
+    # Top Buttons (Settings, Refresh, & Open); icons are masked from the exported SVGs
+    buttons_html = """
         <div class="top-buttons">
             <div class="icon-btn" onclick="pycmd('focumon_settings')" title="Settings">
-                {gear_svg}
+                <div class="icon icon-gear"></div>
             </div>
             <div class="icon-btn" onclick="pycmd('focumon_refresh')" title="Refresh">
-                {refresh_svg}
+                <div class="icon icon-refresh"></div>
             </div>
             <div class="icon-btn" onclick="pycmd('focumon_open')" title="Open Focumon">
-                {gamepad_svg}
+                <div class="icon icon-gamepad"></div>
             </div>
         </div>
     """
     
-    if not stats_data or len(stats_data) <= 1:  # Only username or nothing
+    if loading:
+        # Shown on the very first render while stats are fetched in the background
+        return f"""
+            <div id="focumon-widget" data-state="loading">
+                {buttons_html}
+                <div class="no-stats">
+                    Loading<br>
+                    Focumon stats...
+                </div>
+            </div>
+        """
+
+    if stats is None or not stats.has_stats:  # Only username or nothing
         # Load focumon_fam.png
-        import os
-        import base64
         addon_dir = os.path.dirname(__file__)
         img_path = os.path.join(addon_dir, "focumon_fam.png")
         img_html = ""
         if os.path.exists(img_path):
-            with open(img_path, "rb") as f:
-                b64_data = base64.b64encode(f.read()).decode('utf-8')
-                img_html = f'<img src="data:image/png;base64,{b64_data}" style="width: 45%; height: auto; margin-bottom: 0px; border-radius: 8px;">'
+            img_html = f'<img src="{WEB_BASE}focumon_fam.png" style="width: 45%; height: auto; margin-bottom: 0px; border-radius: 8px;">'
 
         # Show placeholder when no stats are available
         return f"""
-            <div id="focumon-widget">
+            <div id="focumon-widget" data-state="empty">
                 {buttons_html}
                 {img_html}
                 <div class="no-stats" style="margin-top: 5px;">
@@ -230,21 +306,18 @@ def generate_html(stats_data=None):
     html_parts.append(buttons_html)
 
     # Username at the top
-    username = stats_data.get('username', 'Trainer')
+    username = stats.username or 'Trainer'
     html_parts.append(f'<div class="widget-username">{username}</div>')
     
     # Display sprites side by side if available
-    if 'trainer_sprite_data' in stats_data or 'focumon_sprite_data' in stats_data:
-        import base64
+    if stats.trainer_sprite_data is not None or stats.focumon_sprite_data is not None:
         sprites_html = '<div class="sprites-container">'
         
-        if 'trainer_sprite_data' in stats_data:
-            sprite_b64 = base64.b64encode(stats_data['trainer_sprite_data']).decode('utf-8')
-            sprites_html += f'<img class="sprite trainer" src="data:image/png;base64,{sprite_b64}" alt="Trainer">'
+        if stats.trainer_sprite_data is not None:
+            sprites_html += f'<img class="sprite trainer" src="{get_sprite_src(stats, "trainer_sprite")}" alt="Trainer">'
         
-        if 'focumon_sprite_data' in stats_data:
-            sprite_b64 = base64.b64encode(stats_data['focumon_sprite_data']).decode('utf-8')
-            sprites_html += f'<img class="sprite focumon" src="data:image/png;base64,{sprite_b64}" alt="Focumon">'
+        if stats.focumon_sprite_data is not None:
+            sprites_html += f'<img class="sprite focumon" src="{get_sprite_src(stats, "focumon_sprite")}" alt="Focumon">'
         
         sprites_html += '</div>'
         html_parts.append(sprites_html)
@@ -253,98 +326,117 @@ def generate_html(stats_data=None):
     html_parts.append('<div class="widget-content">')
     
     # Display trainer level if available
-    if 'trainer_level' in stats_data:
+    if stats.trainer_level is not None:
         html_parts.append(f'''
             <div class="stat-row">
                 <span class="stat-label">Level</span>
-                <span class="stat-value">LV.{stats_data["trainer_level"]}</span>
+                <span class="stat-value" data-field="level">LV.{stats.trainer_level}</span>
             </div>
         ''')
     
     # Display Focudex progress if available
-    if 'focudex_progress' in stats_data:
+    if stats.focudex_current is not None:
         html_parts.append(f'''
             <div class="stat-row">
                 <span class="stat-label">Focudex</span>
-                <span class="stat-value">{stats_data["focudex_progress"]}</span>
+                <span class="stat-value" data-field="focudex">{stats.focudex_progress}</span>
             </div>
         ''')
     
     html_parts.append('</div>')  # Close widget-content
     
-    return f'<div id="focumon-widget">{"" .join(html_parts)}</div>'
+    if stats.stale:
+        # Last known stats while focumon.com can't be reached
+        return f'<div id="focumon-widget" class="stale" data-state="stats" title="Offline: showing last known stats">{"" .join(html_parts)}</div>'
+    return f'<div id="focumon-widget" data-state="stats">{"" .join(html_parts)}</div>'
 
-def fetch_stats():
-    """Fetch Focumon stats for the configured username."""
+def get_config():
     addon_id = mw.addonManager.addonFromModule(__name__)
-    config = mw.addonManager.getConfig(addon_id)
-    username = config.get("focumon_username", "").strip() if config else ""
+    return mw.addonManager.getConfig(addon_id)
+
+def get_username():
+    """Return the Focumon username for the current Anki profile, or an empty string."""
+    return stats_service.get_username(get_config(), getattr(mw.pm, "name", None))
+
+@instrumentation.timed("deck_widget.fetch_stats")
+def fetch_stats(username=None):
+    """
+    Fetch Focumon stats for the configured username.
+    Safe to call from a background thread when username is passed in.
+    """
+    if username is None:
+        username = get_username()
     
     if not username:
         return None
     
     try:
-        url = f"https://www.focumon.com/trainers/{username}"
-        req = urllib.request.Request(
-            url,
-            headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-        )
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            html = response.read().decode('utf-8')
-        
-        # Parse stats
-        stats_data = {'username': username}
-        
-        levels = scrapers.extract_levels(html)
-        if levels:
-            if 'trainer_level' in levels:
-                stats_data['trainer_level'] = levels['trainer_level']
-            if 'focumon_level' in levels:
-                stats_data['focumon_level'] = levels['focumon_level']
-        
-        focudex = scrapers.extract_focudex(html)
-        if focudex:
-            stats_data['focudex_progress'] = focudex
-        
-        focumon_name = scrapers.extract_focumon_name(html)
-        if focumon_name:
-            stats_data['focumon_name'] = focumon_name
-        
-        sprite_urls = scrapers.extract_sprite_urls(html)
-        if sprite_urls:
-            if 'trainer_sprite' in sprite_urls:
-                try:
-                    sprite_url = f"https://www.focumon.com{sprite_urls['trainer_sprite']}"
-                    req = urllib.request.Request(sprite_url, headers={'User-Agent': 'Mozilla/5.0'})
-                    with urllib.request.urlopen(req, timeout=3) as response:
-                        stats_data['trainer_sprite_data'] = response.read()
-                except:
-                    pass
-            
-            if 'focumon_sprite' in sprite_urls:
-                try:
-                    sprite_url = f"https://www.focumon.com{sprite_urls['focumon_sprite']}"
-                    req = urllib.request.Request(sprite_url, headers={'User-Agent': 'Mozilla/5.0'})
-                    with urllib.request.urlopen(req, timeout=3) as response:
-                        stats_data['focumon_sprite_data'] = response.read()
-                except:
-                    pass
-        
-        return stats_data if len(stats_data) > 1 else None
-        
-    except:
+        # Shared with the Profile dialog: if it is already fetching this
+        # trainer, wait for its result instead of requesting the page again
+        return stats_service.fetch(username, get_config(), timeout=5)
+    except Exception as e:
+        # Offline or the request failed: serve the last good stats, marked stale
+        print(f"Focumon: fetching stats failed: {e}")
+        cached_stats, _ = stats_cache.load(username, 0)
+        if cached_stats:
+            return cached_stats.mark_stale()
         return None
 
-def get_svg_content(filename):
-    """Read SVG content from assets folder."""
-    import os
-    addon_dir = os.path.dirname(__file__)
-    path = os.path.join(addon_dir, "assets", filename)
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
-    return ""
+def get_sprite_src(stats, key):
+    """URL of a sprite in the sprite store, falling back to a data: URI if it isn't on disk."""
+    asset_path = getattr(stats, key)
+    if asset_path and os.path.exists(sprite_store.sprite_path(asset_path)):
+        return f"{WEB_BASE}user_files/sprites/{sprite_store.sprite_filename(asset_path)}"
+    
+    import base64
+    sprite_b64 = base64.b64encode(getattr(stats, f"{key}_data")).decode('utf-8')
+    return f"data:image/png;base64,{sprite_b64}"
+
+def get_stylesheet_url():
+    """
+    Write the compiled stylesheet to user_files/css under a content-hashed name
+    and return its URL. Returns None if it can't be written.
+    """
+    css = generate_css()
+    url = stylesheet_urls.get(css)
+    if url:
+        return url
+    
+    import hashlib
+    filename = f"widget-{get_theme()}-{hashlib.sha1(css.encode('utf-8')).hexdigest()[:12]}.css"
+    path = os.path.join(CSS_DIR, filename)
+    try:
+        if not os.path.exists(path):
+            os.makedirs(CSS_DIR, exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(css)
+            os.replace(f"{path}.tmp", path)
+            remove_old_stylesheets(filename)
+    except OSError as e:
+        print(f"Focumon: failed to write widget stylesheet: {e}")
+        return None
+    
+    url = f"{WEB_BASE}user_files/css/{filename}"
+    stylesheet_urls[css] = url
+    return url
+
+def remove_old_stylesheets(current):
+    """
+    Keep one stylesheet per theme: delete this theme's earlier versions (and
+    files from before names carried the theme) once `current` is written.
+    """
+    theme_prefix = current.rsplit("-", 1)[0] + "-"
+    for name in os.listdir(CSS_DIR):
+        if not name.startswith("widget-") or not name.endswith(".css") or name == current:
+            continue
+        if name.startswith(theme_prefix) or name.count("-") == 1:
+            try:
+                os.remove(os.path.join(CSS_DIR, name))
+            except OSError:
+                pass
+    for css, url in list(stylesheet_urls.items()):
+        if url.rsplit("/", 1)[-1].startswith(theme_prefix) and not url.endswith(current):
+            del stylesheet_urls[css]
 
 def handle_focumon_commands(handled, message, context):
     """Handle JS messages from the widget."""
@@ -352,7 +444,7 @@ def handle_focumon_commands(handled, message, context):
         from .settings import SettingsDialog
         d = SettingsDialog(mw)
         if d.exec():
-            reset_cache()
+            apply_settings()
             mw.deckBrowser.refresh()
         return (True, None)
     elif message == "focumon_open":
@@ -363,9 +455,9 @@ def handle_focumon_commands(handled, message, context):
         mw.focumon_window.activateWindow()
         return (True, None)
     elif message == "focumon_refresh":
-        reset_cache()
-        if mw.state == "deckBrowser":
-            mw.deckBrowser.refresh()
+        # Explicit refresh bypasses the minimum refetch interval;
+        # the widget is patched in place once the fetch lands
+        invalidate(force=True)
         
         # Also refresh the Focumon window content if it's initialized
         if hasattr(mw, "focumon_window"):
@@ -374,17 +466,147 @@ def handle_focumon_commands(handled, message, context):
         return (True, None)
     return handled
 
-# Register command handler
-gui_hooks.webview_did_receive_js_message.append(handle_focumon_commands)
+def build_widget_html(stats=None, loading=False):
+    """Wrap the widget markup and its stylesheet in the container div."""
+    css_url = get_stylesheet_url()
+    if css_url:
+        style = f"<link id='focumon-widget-css' rel='stylesheet' href='{css_url}'>"
+    else:
+        style = f"<style>{generate_css()}</style>"
+    # Defines focumonWidget.update() used by patch_deck_browser
+    script = f"<script src='{WEB_BASE}assets/widget.js'></script>"
+    html_content = generate_html(stats, loading=loading)
+    return f"<div id='focumon-widget-container'>{style}{script}{html_content}</div>"
+
+def widget_state(stats):
+    """The values focumonWidget.update() patches into an already rendered widget."""
+    state = {
+        'css': get_stylesheet_url(),
+        'username': stats.username or 'Trainer',
+        'level': f"LV.{stats.trainer_level}" if stats.trainer_level is not None else None,
+        'focudex': stats.focudex_progress,
+        'trainer_sprite': None,
+        'focumon_sprite': None,
+        'stale': stats.stale,
+    }
+    for key in ('trainer_sprite', 'focumon_sprite'):
+        if getattr(stats, f"{key}_data") is not None:
+            state[key] = get_sprite_src(stats, key)
+    return state
+
+def patch_deck_browser(html, stats=None):
+    """
+    Update the widget in the live deck browser without re-rendering the deck list.
+    Changed values are patched node by node through focumonWidget.update(); if the
+    widget's structure differs (e.g. loading card -> stats), the container is swapped.
+    """
+    if mw.state != "deckBrowser" or not getattr(mw.deckBrowser, "web", None):
+        return
+    state = widget_state(stats) if stats is not None and stats.has_stats else None
+    js = (
+        "(function() {"
+        f"var data = {json.dumps(state)};"
+        "if (data && window.focumonWidget && focumonWidget.update(data)) { return; }"
+        "var el = document.getElementById('focumon-widget-container');"
+        f"if (el) {{ el.outerHTML = {json.dumps(html)}; }}"
+        "})();"
+    )
+    mw.deckBrowser.web.eval(js)
+
+def set_stats(username, stats):
+    """Replace the stats model. Rendered markup is keyed by the stats, so
+    unchanged stats (e.g. after a 304 Not Modified) keep their markup."""
+    global current_stats, stats_username
+    current_stats = stats
+    stats_username = username
+
+def render_widget():
+    """Markup for the current stats and theme, built at most once per combination."""
+    loading = current_stats is None and not stats_valid
+    key = (current_stats, get_theme(), loading)
+    html = rendered_html.get(key)
+    if html is None:
+        html = build_widget_html(current_stats, loading=loading)
+        if len(rendered_html) >= MAX_RENDERED:
+            del rendered_html[next(iter(rendered_html))]
+        rendered_html[key] = html
+    return html
+
+def on_stats_fetched(username, stats):
+    """Pick up stats fetched elsewhere (e.g. by the Profile dialog) for the shown trainer."""
+    def apply():
+        if stats is None or username != stats_username or stats == current_stats:
+            return
+        set_stats(username, stats)
+        patch_deck_browser(render_widget(), current_stats)
+    mw.taskman.run_on_main(apply)
+
+stats_service.listeners.append(on_stats_fetched)
+
+def refresh_in_background(on_complete=None):
+    """
+    Fetch stats off the main thread and patch the widget once they arrive.
+    Returns False if a refresh is already running. `on_complete(success)` is
+    called on the main thread when the fetch finishes.
+    """
+    global refresh_in_flight
+    if refresh_in_flight:
+        return False
+    
+    username = get_username()
+    generation = cache_generation
+    refresh_in_flight = True
+    scheduler.mark_fetched()
+    
+    def on_done(future):
+        global stats_valid, refresh_in_flight, needs_refetch
+        refresh_in_flight = False
+        try:
+            stats = future.result()
+        except Exception as e:
+            print(f"Focumon: background refresh failed: {e}")
+            stats = None
+        
+        if username != get_username():
+            # The trainer changed while we were fetching (settings saved or
+            # profile switched); these stats are for someone no longer shown
+            if on_complete:
+                on_complete(False)
+            if mw.state == "deckBrowser":
+                refresh_in_background()
+            return
+        
+        set_stats(username, stats)
+        success = stats is not None and not stats.stale
+        if generation == cache_generation:
+            stats_valid = True
+            if success:
+                # The disk entry was just rewritten, so it can be trusted again
+                needs_refetch = False
+        patch_deck_browser(render_widget(), current_stats)
+        
+        if stats is not None and stats.stale:
+            schedule_retry()
+        elif success:
+            retry_timer.stop()
+        
+        if on_complete:
+            on_complete(success)
+        
+        # The cache was invalidated while we were fetching, go again
+        if generation != cache_generation and mw.state == "deckBrowser":
+            refresh_in_background()
+    
+    mw.taskman.run_in_background(lambda: fetch_stats(username), on_done)
+    return True
 
 def add_widget_to_deck_browser(deck_browser: aqt.deckbrowser.DeckBrowser, 
                                 content: aqt.deckbrowser.DeckBrowserContent):
     """Appends the Focumon widget to the deck browser's stats area."""
-    global cached_html
+    global stats_valid
     
     # Check if widget should be hidden
-    addon_id = mw.addonManager.addonFromModule(__name__)
-    config = mw.addonManager.getConfig(addon_id)
+    config = get_config()
     if config and config.get("hide_deck_widget", False):
         return
 
@@ -392,27 +614,150 @@ def add_widget_to_deck_browser(deck_browser: aqt.deckbrowser.DeckBrowser,
     if "<div id='focumon-widget-container'>" in content.stats:
         return
     
-    if cached_html is None:
-        stats_data = fetch_stats()
-        css = generate_css()
-        html_content = generate_html(stats_data)
-        cached_html = f"<div id='focumon-widget-container'><style>{css}</style>{html_content}</div>"
+    username = get_username()
+    if username != stats_username:
+        # First render, or the username changed: start from the on-disk cache
+        set_stats(username, None)
+        stats_valid = False
+        if username:
+            # Stale-while-revalidate: a fresh disk entry is served as-is,
+            # a stale one is shown while the network fetch runs
+            ttl = stats_cache.get_ttl_seconds(config)
+            disk_stats, is_fresh = stats_cache.load(username, ttl)
+            if disk_stats:
+                set_stats(username, disk_stats)
+                stats_valid = is_fresh and not needs_refetch
+        else:
+            # Nothing to fetch, the pairing prompt renders instantly
+            stats_valid = True
+    
+    if not stats_valid:
+        # Never block the render on the network: show the last known
+        # widget (or a loading card) and patch it in when the fetch lands
+        refresh_in_background()
     
-    content.stats += cached_html
+    content.stats += render_widget()
 
 def reset_cache(*args, **kwargs):
-    """Clears the cached HTML, forcing a refresh on next view."""
-    global cached_html
-    cached_html = None
+    """Marks the cached stats as stale, forcing a refetch on next view."""
+    global stats_valid, cache_generation, needs_refetch
+    stats_valid = False
+    cache_generation += 1
+    needs_refetch = True
 
-def on_theme_change():
-    """Reset cache and refresh deck browser when theme changes."""
+def rerender_widget():
+    """Rebuild the widget from the stats already in memory, without any network I/O."""
+    if stats_username is None:
+        # Nothing rendered yet
+        return
+    patch_deck_browser(render_widget(), current_stats)
+
+def refetch_widget():
+    """Mark the stats stale and fetch fresh ones in the background."""
     reset_cache()
-    if mw.state == "deckBrowser":
-        mw.deckBrowser.refresh()
-
-# Register hooks
-gui_hooks.deck_browser_will_render_content.append(add_widget_to_deck_browser)
-gui_hooks.reviewer_will_end.append(reset_cache)
-gui_hooks.sync_did_finish.append(reset_cache)
-gui_hooks.theme_did_change.append(on_theme_change)
+    config = get_config()
+    if config and config.get("hide_deck_widget", False):
+        return
+    refresh_in_background()
+
+def get_min_refresh_interval():
+    config = get_config()
+    try:
+        return float(config.get("min_refresh_interval_seconds", DEFAULT_MIN_INTERVAL))
+    except (AttributeError, TypeError, ValueError):
+        return DEFAULT_MIN_INTERVAL
+
+scheduler = RefreshScheduler(rerender_widget, refetch_widget, get_min_refresh_interval())
+
+def invalidate(*args, refetch=True, force=False, **kwargs):
+    """
+    Entry point for everything that makes the widget out of date.
+    Bursts of calls are coalesced; `refetch=False` only re-renders.
+    """
+    scheduler.min_interval = get_min_refresh_interval()
+    if refetch:
+        scheduler.request_refetch(force=force)
+    else:
+        scheduler.request_rerender()
+
+# Re-probes the network after a failed refresh left stale stats on screen
+retry_timer = QTimer()
+retry_timer.setSingleShot(True)
+retry_timer.timeout.connect(lambda: invalidate())
+
+def schedule_retry():
+    """Refetch once the circuit breaker lets a probe through again."""
+    # The scheduler still holds the refetch to the minimum interval
+    retry_timer.start(int(max(http_client.breaker.retry_in(), 1) * 1000))
+
+def poll_stats(on_complete):
+    """Background poll: refetch unless there's nothing to show."""
+    config = get_config()
+    if not get_username() or (config and config.get("hide_deck_widget", False)):
+        return False
+    reset_cache()
+    return refresh_in_background(on_complete)
+
+def get_poll_interval():
+    config = get_config()
+    try:
+        return max(0.0, float(config.get("poll_interval_minutes", 0))) * 60
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+poller = StatsPoller(
+    poll_stats,
+    get_poll_interval,
+    lambda: mw.state == "review",
+    lambda: scheduler.last_fetch,
+)
+poller.reconfigure()
+
+def apply_settings():
+    """Called after the settings dialog is saved."""
+    if stats_username is not None and get_username() != stats_username:
+        # A different trainer is shown now
+        invalidate(force=True)
+    else:
+        # Same trainer; the widget may only have been hidden or shown
+        invalidate(refetch=False)
+    # Newly mapped profiles are warmed; already cached trainers are skipped
+    prefetch_profiles()
+    poller.reconfigure()
+
+def prefetch_profiles():
+    """
+    On shared machines, warm the cache for every mapped trainer when a profile
+    opens, so switching Anki profiles shows the right widget straight from disk.
+    """
+    config = get_config()
+    if not config or not config.get("per_profile_username", False):
+        return
+    if config.get("hide_deck_widget", False):
+        return
+    stats_service.prefetch(stats_service.get_all_usernames(config), config)
+
+def on_theme_change():
+    """Re-render the widget in the new theme; the stats themselves did not change."""
+    invalidate(refetch=False)
+
+def unregister():
+    """Remove this module's hooks and stop its timers, e.g. before it is reloaded."""
+    for hook, callback in HOOKS:
+        hook.remove(callback)
+    if on_stats_fetched in stats_service.listeners:
+        stats_service.listeners.remove(on_stats_fetched)
+    scheduler.timer.stop()
+    poller.timer.stop()
+    retry_timer.stop()
+
+# Register hooks; rendering and profile prefetch are hooked up in __init__,
+# which imports this module on the first deck browser render
+HOOKS = (
+    (gui_hooks.webview_did_receive_js_message, handle_focumon_commands),
+    (gui_hooks.reviewer_will_end, invalidate),
+    (gui_hooks.sync_did_finish, invalidate),
+    (gui_hooks.theme_did_change, on_theme_change),
+)
+for hook, callback in HOOKS:
+    hook.append(callback)
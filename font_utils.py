@@ -20,44 +20,82 @@ def load_custom_font(font_name="Silkscreen-Regular.ttf"):
     return "sans-serif"
 
 
+# Fonts embedded in the widget CSS: (CSS family name, file in assets/)
+FONT_FACES = (
+    ("FE5Cent", "FE5Cent-Regular.ttf"),
+    ("Silkscreen", "Silkscreen-Regular.ttf"),
+)
+
+# Encoded fonts keyed by file name -> (mtime, base64 string), so each file
+# is read and encoded once per process unless it changes on disk
+_font_cache = {}
+
+# Generated @font-face CSS keyed by base URL -> (font mtimes, css)
+_font_face_cache = {}
+
+
+def _font_mtime(font_name):
+    font_path = os.path.join(os.path.dirname(__file__), "assets", font_name)
+    try:
+        return os.path.getmtime(font_path)
+    except OSError:
+        return None
+
+
 def get_font_base64(font_name="Silkscreen-Regular.ttf"):
     """Load a custom font and return as base64-encoded string for CSS embedding."""
     font_path = os.path.join(os.path.dirname(__file__), "assets", font_name)
     
+    mtime = _font_mtime(font_name)
+    if mtime is None:
+        # Return None if font file is not found
+        return None
+    
+    cached = _font_cache.get(font_name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
     try:
         with open(font_path, 'rb') as f:
             font_data = f.read()
-        return base64.b64encode(font_data).decode('utf-8')
     except FileNotFoundError:
-        # Return None if font file is not found
         return None
+    
+    encoded = base64.b64encode(font_data).decode('utf-8')
+    _font_cache[font_name] = (mtime, encoded)
+    return encoded
 
-def get_font_face_css():
-    """Generate @font-face CSS rules for Focumon fonts."""
-    css = ""
+def get_font_face_css(base_url=None):
+    """
+    Generate @font-face CSS rules for Focumon fonts.
+    With base_url (e.g. the add-on's web export prefix) the fonts are referenced
+    by URL so the webview can cache them; otherwise they are embedded as base64.
+    The result is cached and only rebuilt when a font file changes.
+    """
+    key = tuple(_font_mtime(font_name) for _, font_name in FONT_FACES)
+    cached = _font_face_cache.get(base_url)
+    if cached and cached[0] == key:
+        return cached[1]
     
-    # FE5Cent
-    fe5_b64 = get_font_base64("FE5Cent-Regular.ttf")
-    if fe5_b64:
-        css += f"""
-        @font-face {{
-            font-family: 'FE5Cent';
-            src: url(data:font/truetype;charset=utf-8;base64,{fe5_b64}) format('truetype');
-            font-weight: normal;
-            font-style: normal;
-        }}
-        """
-        
-    # Silkscreen
-    silk_b64 = get_font_base64("Silkscreen-Regular.ttf")
-    if silk_b64:
+    css = ""
+    for (family, font_name), mtime in zip(FONT_FACES, key):
+        if mtime is None:
+            continue
+        if base_url is not None:
+            src = f"url('{base_url}assets/{font_name}')"
+        else:
+            font_b64 = get_font_base64(font_name)
+            if not font_b64:
+                continue
+            src = f"url(data:font/truetype;charset=utf-8;base64,{font_b64})"
         css += f"""
         @font-face {{
-            font-family: 'Silkscreen';
-            src: url(data:font/truetype;charset=utf-8;base64,{silk_b64}) format('truetype');
+            font-family: '{family}';
+            src: {src} format('truetype');
             font-weight: normal;
             font-style: normal;
         }}
         """
-        
+    
+    _font_face_cache[base_url] = (key, css)
     return css
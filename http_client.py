@@ -0,0 +1,417 @@
+"""
+HTTP Client for Focumon Add-on
+Keeps a small pool of keep-alive HTTPS connections to focumon.com so a refresh
+pays for one TLS handshake, and downloads sprites concurrently.
+"""
+
+import base64
+import http.client
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from . import instrumentation
+
+DEFAULT_BASE_URL = "https://www.focumon.com"
+
+# Where requests go; changed with set_base_url() (e.g. to a local test server)
+FOCUMON_HOST = "www.focumon.com"
+BASE_URL = DEFAULT_BASE_URL
+
+BROWSER_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 3
+
+# Read size when streaming a response body
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Errors that mean a pooled connection went stale and the request can be retried
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+# Errors that count against the circuit breaker: socket errors, timeouts and
+# broken HTTP exchanges. Bad URLs or headers are configuration errors and don't.
+NETWORK_ERRORS = (OSError, http.client.HTTPException)
+
+# Consecutive network failures before requests are short-circuited
+FAILURE_THRESHOLD = 3
+
+# How long to stay offline before letting a probe request through, in seconds
+COOLDOWN_SECONDS = 60
+
+
+class CircuitBreaker:
+    """
+    Stops hammering an unreachable host. After FAILURE_THRESHOLD consecutive
+    failures the circuit opens and requests fail immediately; once the cooldown
+    has passed a single probe request is let through to test the connection.
+    """
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a request may go out now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.probing = True
+            return True
+
+    def retry_in(self):
+        """Seconds until the next probe is allowed (0 when closed)."""
+        if self.opened_at is None:
+            return 0
+        return max(0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def reset(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def end_probe(self):
+        """Let another probe through if this one ended without a verdict."""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                print(f"Focumon: {FOCUMON_HOST} reachable again")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"Focumon: {self.failures} failed requests, going offline")
+                self.opened_at = time.monotonic()
+
+
+def _timed_create_connection(address, timeout, source_address=None):
+    """socket.create_connection(), with the DNS lookup recorded on its own."""
+    host, port = address
+    with instrumentation.span("http.dns", host=host):
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+
+    error = None
+    for _family, _type, _proto, _name, sockaddr in addresses:
+        try:
+            return socket.create_connection(sockaddr[:2], timeout, source_address)
+        except OSError as e:
+            error = e
+    raise error or OSError(f"No addresses found for {host}")
+
+
+def _proxy_for(scheme, host):
+    """
+    The proxy urllib would use for scheme://host, from the *_proxy environment
+    variables or the OS settings. Returns (proxy host[:port], headers to send
+    to the proxy), or None for a direct connection.
+    """
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    headers = {}
+    if parts.username:
+        credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = f"Basic {base64.b64encode(credentials.encode('utf-8')).decode('ascii')}"
+    return parts.netloc.rpartition("@")[2], headers
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of idle keep-alive connections to a single host.
+    Honours the same proxy settings as urllib: HTTPS goes through a CONNECT
+    tunnel, plain HTTP is sent to the proxy with absolute request URLs.
+    """
+
+    def __init__(self, host, max_idle=4, scheme="https"):
+        self.host = host
+        self.max_idle = max_idle
+        self.scheme = scheme
+        self.connection_class = (
+            http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection)
+        self.proxy = _proxy_for(scheme, host)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def request_target(self, path, headers):
+        """The request line target and headers for `path` on this pool's connections."""
+        if self.proxy is None or self.scheme == "https":
+            return path, headers
+        _, proxy_headers = self.proxy
+        return f"http://{self.host}{path}", {**headers, **proxy_headers}
+
+    def acquire(self, timeout):
+        """Return (connection, reused) with the socket timeout set to `timeout`."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+
+        if conn is None:
+            if self.proxy is None:
+                conn = self.connection_class(self.host, timeout=timeout)
+            else:
+                proxy_host, proxy_headers = self.proxy
+                conn = self.connection_class(proxy_host, timeout=timeout)
+                if self.scheme == "https":
+                    conn.set_tunnel(self.host, headers=proxy_headers)
+            conn._create_connection = _timed_create_connection
+            return conn, False
+
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def release(self, conn):
+        """Hand a connection back for reuse, closing it if the pool is full."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pool = ConnectionPool(FOCUMON_HOST)
+breaker = CircuitBreaker()
+_executor = None
+_executor_lock = threading.Lock()
+_base_url_lock = threading.Lock()
+
+
+def set_base_url(base_url=None):
+    """
+    Send requests to another server, e.g. a local stand-in for offline testing.
+    Only the scheme and host[:port] are used; None or "" restores focumon.com.
+    Raises ValueError for anything but an http(s) URL.
+    """
+    global FOCUMON_HOST, BASE_URL, _pool
+    base_url = (base_url or DEFAULT_BASE_URL).strip()
+    parts = urllib.parse.urlsplit(base_url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(f"Unsupported Focumon base URL: {base_url}")
+
+    with _base_url_lock:
+        if parts.netloc == FOCUMON_HOST and f"{parts.scheme}://{parts.netloc}" == BASE_URL:
+            return
+        old_pool = _pool
+        FOCUMON_HOST = parts.netloc
+        BASE_URL = f"{parts.scheme}://{parts.netloc}"
+        _pool = ConnectionPool(FOCUMON_HOST, scheme=parts.scheme)
+        breaker.reset()
+    old_pool.close_all()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="focumon-http")
+        return _executor
+
+
+def _request(path, timeout, headers, consume=None):
+    """
+    Send one GET over a pooled connection, retrying if a reused connection went
+    stale before any of the body was streamed.
+    With `consume`, a 200 body is streamed to it in chunks instead of being returned;
+    if it returns True the rest of the body is skipped and the connection dropped.
+    """
+    pool = _pool  # A concurrent set_base_url() must not mix hosts within one request
+    fed = False
+
+    def feed(chunk):
+        nonlocal fed
+        fed = True
+        return consume(chunk)
+
+    while True:
+        conn, reused = pool.acquire(timeout)
+        try:
+            # Timed phase by phase: http.connect (including http.dns) only for
+            # new connections, then time to first byte, then the body
+            if not reused:
+                with instrumentation.span("http.connect", host=pool.host):
+                    conn.connect()
+            with instrumentation.span("http.ttfb", path=path, reused=reused) as details:
+                target, request_headers = pool.request_target(path, headers)
+                conn.request("GET", target, headers=request_headers)
+                response = conn.getresponse()
+                details["status"] = response.status
+            with instrumentation.span("http.body", path=path) as details:
+                if consume is not None and response.status == 200:
+                    body = None
+                    complete = _stream_body(response, feed)
+                else:
+                    body = response.read()
+                    complete = True
+                    details["bytes"] = len(body)
+                details["complete"] = complete
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            # A retry would feed `consume` the start of the body a second time
+            if reused and not fed:
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+
+        if not complete or response.will_close:
+            conn.close()
+        else:
+            pool.release(conn)
+        return response, body
+
+
+def _stream_body(response, consume):
+    """Feed the body to `consume` chunk by chunk. Returns False if it stopped early."""
+    while True:
+        chunk = response.read1(STREAM_CHUNK_SIZE)
+        if not chunk:
+            if response.length:
+                # read1() doesn't raise when the server closes before Content-Length
+                raise http.client.IncompleteRead(b"", response.length)
+            return True
+        if consume(chunk):
+            return response.isclosed()
+
+
+def _get(path, timeout, user_agent, extra_headers=None, consume=None):
+    """GET a path, following same-host redirects. Returns (url, response, body)."""
+    headers = {"User-Agent": user_agent, "Connection": "keep-alive"}
+    if extra_headers:
+        headers.update(extra_headers)
+    url = f"{BASE_URL}{path}"
+
+    for _ in range(MAX_REDIRECTS + 1):
+        if not breaker.allow():
+            raise urllib.error.URLError(
+                f"{FOCUMON_HOST} is unreachable, retrying in {breaker.retry_in():.0f}s")
+        try:
+            response, body = _request(path, timeout, headers, consume)
+        except (http.client.InvalidURL, ValueError) as e:
+            # The request itself is bad (e.g. a username that can't go in a URL)
+            raise urllib.error.URLError(f"Invalid request for {url}: {e}")
+        except NETWORK_ERRORS as e:
+            breaker.record_failure()
+            raise urllib.error.URLError(e)
+        finally:
+            breaker.end_probe()
+
+        if response.status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if response.status in REDIRECT_CODES and response.getheader("Location"):
+            location = urllib.parse.urlsplit(urllib.parse.urljoin(url, response.getheader("Location")))
+            if location.netloc != FOCUMON_HOST:
+                raise urllib.error.HTTPError(url, response.status, "Unexpected redirect", response.msg, None)
+            path = location.path + (f"?{location.query}" if location.query else "")
+            url = f"{BASE_URL}{path}"
+            continue
+
+        return url, response, body
+
+    raise urllib.error.HTTPError(url, response.status, "Too many redirects", response.msg, None)
+
+
+def get(path, timeout=5, user_agent=BROWSER_USER_AGENT):
+    """
+    GET a path on the Focumon server and return the response body as bytes.
+    Raises urllib.error.HTTPError / URLError like urllib.request.urlopen does,
+    so callers can keep their existing error handling.
+    """
+    url, response, body = _get(path, timeout, user_agent)
+    if response.status != 200:
+        raise urllib.error.HTTPError(url, response.status, response.reason, response.msg, None)
+    return body
+
+
+def _conditional_headers(validators):
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _response_validators(response):
+    validators = {}
+    if response.getheader("ETag"):
+        validators["etag"] = response.getheader("ETag")
+    if response.getheader("Last-Modified"):
+        validators["last_modified"] = response.getheader("Last-Modified")
+    return validators
+
+
+def get_streamed(path, consume, validators=None, timeout=5, user_agent=BROWSER_USER_AGENT):
+    """
+    Conditional GET that streams the body to `consume(chunk)` instead of buffering it.
+    `consume` returns True once it has seen enough, which closes the connection
+    without downloading the rest of the page.
+    Returns (modified, validators); modified is False on 304 Not Modified.
+    """
+    extra_headers = _conditional_headers(validators)
+    url, response, _ = _get(path, timeout, user_agent, extra_headers, consume)
+    if response.status == 304 and extra_headers:
+        return False, validators
+    if response.status != 200:
+        raise urllib.error.HTTPError(url, response.status, response.reason, response.msg, None)
+    return True, _response_validators(response)
+
+
+def get_many(paths, timeout=3):
+    """
+    Download several paths concurrently.
+    `paths` maps a key to a path; returns a dict of key -> bytes for the ones that succeeded.
+    """
+    futures = {
+        key: _get_executor().submit(get, path, timeout, "Mozilla/5.0")
+        for key, path in paths.items()
+    }
+
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception:
+            pass  # Fail silently if a sprite can't be downloaded
+    return results
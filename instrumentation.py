@@ -0,0 +1,107 @@
+"""
+Instrumentation for Focumon Add-on
+Records how long the add-on's hot paths take (network phases, parsing, widget
+rendering, window and dialog construction) into a fixed-size ring buffer, so
+slowness in the deck browser can be attributed without a profiler.
+View it from Tools > Focumon > Timings, or export it as JSON.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Oldest events are dropped once the buffer is full
+MAX_EVENTS = 500
+
+_events = deque(maxlen=MAX_EVENTS)
+_lock = threading.Lock()
+
+
+def record(name, seconds, **details):
+    """Add one timing to the buffer. `details` must be JSON-serialisable."""
+    event = {
+        "name": name,
+        "at": time.time(),
+        "ms": round(seconds * 1000, 3),
+        "thread": threading.current_thread().name,
+    }
+    if details:
+        event["details"] = details
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def span(name, **details):
+    """
+    Time the enclosed block. Yields the details dict, so values learned inside
+    the block (status, byte counts) can be added to the event.
+    """
+    started = time.perf_counter()
+    try:
+        yield details
+    finally:
+        record(name, time.perf_counter() - started, **details)
+
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def events():
+    """Snapshot of the buffer, oldest first."""
+    with _lock:
+        return list(_events)
+
+
+def clear():
+    with _lock:
+        _events.clear()
+
+
+def summary():
+    """Per-name count, mean, max and last duration in ms, slowest mean first."""
+    totals = {}
+    for event in events():
+        stats = totals.setdefault(event["name"], {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += event["ms"]
+        stats["max"] = max(stats["max"], event["ms"])
+        stats["last"] = event["ms"]
+
+    rows = [
+        {
+            "name": name,
+            "count": stats["count"],
+            "mean_ms": round(stats["total"] / stats["count"], 3),
+            "max_ms": stats["max"],
+            "last_ms": stats["last"],
+        }
+        for name, stats in totals.items()
+    ]
+    rows.sort(key=lambda row: row["mean_ms"], reverse=True)
+    return rows
+
+
+def export_json(path):
+    """Write the summary and the raw events to `path`."""
+    data = {
+        "exported_at": time.time(),
+        "summary": summary(),
+        "events": events(),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
@@ -2,24 +2,55 @@ from aqt import mw
 from aqt.qt import *
 from aqt.utils import showInfo
 
-try:
-    from aqt.qt import QWebEngineView, QWebEngineProfile, QWebEnginePage
-except ImportError:
-    # Fallback for older Anki versions or specific builds
-    QWebEngineView = None
-
 import os
-import shutil
-from . import scrapers
+from . import cache_janitor
+from . import instrumentation
 
-class FocumonWindow(QMainWindow):
-    def cleanup_cache(self, path):
-        if os.path.exists(path):
-            try:
-                shutil.rmtree(path)
-            except Exception as e:
-                print(f"Failed to clean cache: {e}")
+class PageLifecycleManager(QObject):
+    """
+    Freezes the Focumon page after it has been hidden for a while, and optionally
+    discards it later, so a hidden window stops running page JS and timers and
+    Chromium can reclaim the renderer's memory. Showing the window restores it;
+    a discarded page is reloaded by QtWebEngine when it becomes active again.
+    """
+
+    def __init__(self, page, freeze_after_minutes, discard_after_minutes, parent=None):
+        super().__init__(parent)
+        self.page = page
+        self.freeze_after_ms = int(max(freeze_after_minutes, 0) * 60 * 1000)
+        self.discard_after_ms = int(max(discard_after_minutes, 0) * 60 * 1000)
+        self.states = getattr(type(page), "LifecycleState", None)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.advance)
+
+    def on_hidden(self):
+        if self.states is None or not self.freeze_after_ms:
+            return
+        self.timer.start(self.freeze_after_ms)
+
+    def on_shown(self):
+        self.timer.stop()
+        if self.states is not None and self.page.lifecycleState() != self.states.Active:
+            print("Focumon: resuming page")
+            self.page.setLifecycleState(self.states.Active)
 
+    def advance(self):
+        """Step Active -> Frozen -> Discarded while the page stays hidden."""
+        state = self.page.lifecycleState()
+        if state == self.states.Active:
+            print("Focumon: freezing hidden page")
+            self.page.setLifecycleState(self.states.Frozen)
+            if self.discard_after_ms:
+                self.timer.start(self.discard_after_ms)
+        elif state == self.states.Frozen:
+            print("Focumon: discarding hidden page")
+            self.page.setLifecycleState(self.states.Discarded)
+
+
+class FocumonWindow(QMainWindow):
+    @instrumentation.timed("FocumonWindow.__init__")
     def __init__(self, parent=None):
         super(FocumonWindow, self).__init__(parent)
         self.setWindowTitle("Focumon for Anki")
@@ -33,6 +64,13 @@ class FocumonWindow(QMainWindow):
         if config and config.get("always_on_top", False):
             self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
 
+        # Imported here so nothing WebEngine-related is touched until the window is opened
+        try:
+            from aqt.qt import QWebEngineView, QWebEngineProfile, QWebEnginePage
+        except ImportError:
+            # Fallback for older Anki versions or specific builds
+            QWebEngineView = None
+
         if QWebEngineView is None:
             showInfo("QWebEngineView is not supported on this Anki version.")
             return
@@ -50,19 +88,49 @@ class FocumonWindow(QMainWindow):
 
         # Separate cache path so we can clean it independently from cookies/storage
         cache_path = os.path.join(addon_dir, "cache_trash")
-        self.cleanup_cache(cache_path)
-        
-        # Clean up legacy cache folders from previous versions if they exist in user_data
-        for legacy_folder in ["GPUCache", "DawnCache", "VideoDecodeStats", "ShaderCache", "Code Cache"]:
-            self.cleanup_cache(os.path.join(storage_path, legacy_folder))
+        # Persistent HTTP cache, only used in disk mode
+        http_cache_path = os.path.join(addon_dir, "http_cache")
 
-        profile.setCachePath(cache_path)
+        cache_mode = config.get("browser_cache_mode", "memory") if config else "memory"
+        cache_eviction = config.get("browser_cache_eviction", "lru") if config else "lru"
+        try:
+            cache_max_mb = int(config.get("browser_cache_max_mb", 100)) if config else 100
+        except (TypeError, ValueError):
+            cache_max_mb = 100
+        
+        # Clean the cache and legacy cache folders from previous versions (in user_data).
+        # Folders are renamed away immediately and deleted on a background thread.
+        legacy_folders = ["GPUCache", "DawnCache", "VideoDecodeStats", "ShaderCache", "Code Cache"]
+        trash = [cache_path] + [os.path.join(storage_path, folder) for folder in legacy_folders]
+        if cache_mode != "disk" or cache_eviction == "clear_on_start":
+            trash.append(http_cache_path)
+        cache_janitor.cleanup(trash)
         
         profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies)
-        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+
+        if cache_mode == "disk":
+            # Kept across sessions; Chromium evicts least recently used entries at the size cap
+            profile.setCachePath(http_cache_path)
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        elif cache_mode == "off":
+            profile.setCachePath(cache_path)
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.NoCache)
+        else:
+            profile.setCachePath(cache_path)
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+        profile.setHttpCacheMaximumSize(max(cache_max_mb, 1) * 1024 * 1024)
 
         page = QWebEnginePage(profile, self.browser)
         self.browser.setPage(page)
+
+        # Optionally suspend the page while the window stays hidden. Off by
+        # default: freezing stops the game's timers, so it has to be opted into
+        try:
+            freeze_after = float(config.get("suspend_after_minutes", 0)) if config else 0
+            discard_after = float(config.get("discard_after_minutes", 0)) if config else 0
+        except (TypeError, ValueError):
+            freeze_after, discard_after = 0, 0
+        self.lifecycle = PageLifecycleManager(page, freeze_after, discard_after, self)
         
         # Load Focumon App
         self.browser.setUrl(QUrl("https://www.focumon.com"))
@@ -81,96 +149,22 @@ class FocumonWindow(QMainWindow):
         event.ignore()
         self.hide()
 
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if getattr(self, "lifecycle", None):
+            self.lifecycle.on_hidden()
+
+    def showEvent(self, event):
+        if getattr(self, "lifecycle", None):
+            self.lifecycle.on_shown()
+        super().showEvent(event)
+
     def refresh(self):
         """Reload the current page."""
         if self.browser:
             self.browser.reload()
 
     def sync_stats(self):
-        """
-        Fetches and displays Focumon stats using HTTP request.
-        Works independently of whether the browser window is open.
-        """
-        # Get username from config
-        addon_id = mw.addonManager.addonFromModule(__name__)
-        config = mw.addonManager.getConfig(addon_id)
-        username = config.get("focumon_username", "").strip()
-        
-        if not username:
-            showInfo("Please set your Focumon username in the add-on settings first.\n\nGo to: Tools > Focumon > Settings")
-            return
-        
-        # Fetch profile page
-        try:
-            import urllib.request
-            from .stats_dialog import StatsDialog
-            
-            url = f"https://www.focumon.com/trainers/{username}"
-            
-            # Create request with headers to appear like a browser
-            req = urllib.request.Request(
-                url,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                }
-            )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                html = response.read().decode('utf-8')
-            
-            # Parse stats
-            levels = scrapers.extract_levels(html)
-            focudex = scrapers.extract_focudex(html)
-            focumon_name = scrapers.extract_focumon_name(html)
-            sprite_urls = scrapers.extract_sprite_urls(html)
-            
-            # Prepare data for dialog
-            stats_data = {'username': username}
-            
-            if levels:
-                if 'trainer_level' in levels:
-                    stats_data['trainer_level'] = levels['trainer_level']
-                if 'focumon_level' in levels:
-                    stats_data['focumon_level'] = levels['focumon_level']
-            
-            if focudex:
-                stats_data['focudex_progress'] = focudex
-            
-            if focumon_name:
-                stats_data['focumon_name'] = focumon_name
-            
-            # Download sprite images
-            if sprite_urls:
-                if 'trainer_sprite' in sprite_urls:
-                    try:
-                        sprite_url = f"https://www.focumon.com{sprite_urls['trainer_sprite']}"
-                        req = urllib.request.Request(sprite_url, headers={'User-Agent': 'Mozilla/5.0'})
-                        with urllib.request.urlopen(req, timeout=5) as response:
-                            stats_data['trainer_sprite_data'] = response.read()
-                    except:
-                        pass  # Fail silently if sprite can't be downloaded
-                
-                if 'focumon_sprite' in sprite_urls:
-                    try:
-                        sprite_url = f"https://www.focumon.com{sprite_urls['focumon_sprite']}"
-                        req = urllib.request.Request(sprite_url, headers={'User-Agent': 'Mozilla/5.0'})
-                        with urllib.request.urlopen(req, timeout=5) as response:
-                            stats_data['focumon_sprite_data'] = response.read()
-                    except:
-                        pass  # Fail silently if sprite can't be downloaded
-            
-            if len(stats_data) > 1:  # More than just username
-                dialog = StatsDialog(stats_data, self)
-                dialog.exec()
-            else:
-                showInfo(f"No stats found for @{username}.\n\nThe profile page layout might have changed, or the username might be incorrect.")
-                
-        except urllib.error.HTTPError as e:
-            if e.code == 404:
-                showInfo(f"Profile not found for username: {username}\n\nPlease check your username in the settings.")
-            else:
-                showInfo(f"HTTP Error {e.code}: {e.reason}")
-        except urllib.error.URLError as e:
-            showInfo(f"Network error: {e.reason}\n\nPlease check your internet connection.")
-        except Exception as e:
-            showInfo(f"Error fetching stats: {str(e)}")
\ No newline at end of file
+        """Show the Profile stats dialog. Kept for callers that still go through the window."""
+        from .profile_sync import sync_stats
+        sync_stats(self)
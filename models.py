@@ -0,0 +1,178 @@
+"""
+Stats Model for Focumon Add-on
+ProfileStats is the single representation of a trainer's stats shared by the
+deck widget, the Profile dialog and the on-disk cache.
+"""
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_fraction(value):
+    """'2/186' -> (2, 186); anything else -> (None, None)."""
+    if not value:
+        return None, None
+    parts = str(value).split('/')
+    if len(parts) != 2:
+        return None, None
+    current, total = _parse_int(parts[0]), _parse_int(parts[1])
+    if current is None or total is None:
+        return None, None
+    return current, total
+
+
+class ProfileStats:
+    """
+    Stats scraped from a trainer's profile page.
+
+    Instances are treated as immutable. Equality and hashing cover every field
+    except the raw sprite bytes: sprite asset paths are content-addressed, so
+    the same path always means the same image.
+    """
+
+    __slots__ = (
+        "username",
+        "trainer_level",
+        "focumon_level",
+        "focudex_current",
+        "focudex_total",
+        "focumon_name",
+        "trainer_sprite",
+        "focumon_sprite",
+        "trainer_sprite_data",
+        "focumon_sprite_data",
+        "stale",
+        "_key",
+    )
+
+    def __init__(self, username, trainer_level=None, focumon_level=None,
+                 focudex_current=None, focudex_total=None, focumon_name=None,
+                 trainer_sprite=None, focumon_sprite=None,
+                 trainer_sprite_data=None, focumon_sprite_data=None, stale=False):
+        self.username = username
+        self.trainer_level = trainer_level
+        self.focumon_level = focumon_level
+        self.focudex_current = focudex_current
+        self.focudex_total = focudex_total
+        self.focumon_name = focumon_name
+        self.trainer_sprite = trainer_sprite
+        self.focumon_sprite = focumon_sprite
+        self.trainer_sprite_data = trainer_sprite_data
+        self.focumon_sprite_data = focumon_sprite_data
+        self.stale = stale
+        self._key = (
+            username, trainer_level, focumon_level, focudex_current, focudex_total,
+            focumon_name, trainer_sprite, focumon_sprite,
+            trainer_sprite_data is not None, focumon_sprite_data is not None, stale,
+        )
+
+    @classmethod
+    def from_profile(cls, username, profile, sprites=None):
+        """Build from a scrapers.Profile and the dict returned by sprite_store.fetch_sprites()."""
+        sprites = sprites or {}
+        focudex_current, focudex_total = _parse_fraction(profile.focudex_progress)
+        return cls(
+            username,
+            trainer_level=_parse_int(profile.trainer_level),
+            focumon_level=_parse_int(profile.focumon_level),
+            focudex_current=focudex_current,
+            focudex_total=focudex_total,
+            focumon_name=profile.focumon_name,
+            trainer_sprite=profile.trainer_sprite,
+            focumon_sprite=profile.focumon_sprite,
+            trainer_sprite_data=sprites.get('trainer_sprite_data'),
+            focumon_sprite_data=sprites.get('focumon_sprite_data'),
+        )
+
+    @classmethod
+    def from_json(cls, data, trainer_sprite_data=None, focumon_sprite_data=None):
+        """Inverse of to_json(); sprite bytes are supplied separately."""
+        focudex_current, focudex_total = _parse_fraction(data.get('focudex_progress'))
+        return cls(
+            data.get('username', ''),
+            trainer_level=_parse_int(data.get('trainer_level')),
+            focumon_level=_parse_int(data.get('focumon_level')),
+            focudex_current=focudex_current,
+            focudex_total=focudex_total,
+            focumon_name=data.get('focumon_name'),
+            trainer_sprite=data.get('trainer_sprite'),
+            focumon_sprite=data.get('focumon_sprite'),
+            trainer_sprite_data=trainer_sprite_data,
+            focumon_sprite_data=focumon_sprite_data,
+        )
+
+    def to_json(self):
+        """JSON-serialisable dict without the sprite bytes."""
+        data = {
+            'username': self.username,
+            'trainer_level': self.trainer_level,
+            'focumon_level': self.focumon_level,
+            'focudex_progress': self.focudex_progress,
+            'focumon_name': self.focumon_name,
+            'trainer_sprite': self.trainer_sprite,
+            'focumon_sprite': self.focumon_sprite,
+        }
+        return {key: value for key, value in data.items() if value is not None}
+
+    def mark_stale(self):
+        """Copy of these stats flagged as the last known values."""
+        return ProfileStats(
+            self.username, self.trainer_level, self.focumon_level,
+            self.focudex_current, self.focudex_total, self.focumon_name,
+            self.trainer_sprite, self.focumon_sprite,
+            self.trainer_sprite_data, self.focumon_sprite_data, stale=True,
+        )
+
+    def with_sprites(self, sprites):
+        """Copy with sprite bytes from sprite_store.fetch_sprites() filling in what's missing."""
+        return ProfileStats(
+            self.username, self.trainer_level, self.focumon_level,
+            self.focudex_current, self.focudex_total, self.focumon_name,
+            self.trainer_sprite, self.focumon_sprite,
+            self.trainer_sprite_data or sprites.get('trainer_sprite_data'),
+            self.focumon_sprite_data or sprites.get('focumon_sprite_data'),
+            stale=self.stale,
+        )
+
+    @property
+    def missing_sprite_urls(self):
+        """Sprite paths whose image bytes are not loaded, shaped like Profile.sprite_urls()."""
+        return {
+            key: path for key, path, data in (
+                ('trainer_sprite', self.trainer_sprite, self.trainer_sprite_data),
+                ('focumon_sprite', self.focumon_sprite, self.focumon_sprite_data),
+            )
+            if path is not None and data is None
+        }
+
+    @property
+    def focudex_progress(self):
+        """Focudex progress as displayed on the site, e.g. '2/186'."""
+        if self.focudex_current is None:
+            return None
+        return f"{self.focudex_current}/{self.focudex_total}"
+
+    @property
+    def has_stats(self):
+        """True if anything beyond the username was found."""
+        fields = (
+            self.trainer_level, self.focumon_level, self.focudex_current, self.focudex_total,
+            self.focumon_name, self.trainer_sprite, self.focumon_sprite,
+            self.trainer_sprite_data, self.focumon_sprite_data,
+        )
+        return any(value is not None for value in fields)
+
+    def __eq__(self, other):
+        if not isinstance(other, ProfileStats):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return f"ProfileStats({self.username!r}, level={self.trainer_level}, focudex={self.focudex_progress!r})"
@@ -0,0 +1,57 @@
+"""
+Profile Stats for Focumon Add-on
+Fetches the trainer profile over HTTP and shows it in the StatsDialog.
+Kept separate from FocumonWindow so the Profile action never has to
+construct the embedded browser.
+"""
+
+from aqt import mw
+from aqt.utils import showInfo
+import urllib.error
+
+from . import stats_cache
+from . import stats_service
+
+
+def sync_stats(parent=None):
+    """
+    Fetches and displays Focumon stats using HTTP request.
+    Works independently of whether the browser window is open.
+    """
+    # Get username from config
+    addon_id = mw.addonManager.addonFromModule(__name__)
+    config = mw.addonManager.getConfig(addon_id)
+    username = stats_service.get_username(config, getattr(mw.pm, "name", None))
+
+    if not username:
+        showInfo("Please set your Focumon username in the add-on settings first.\n\nGo to: Tools > Focumon > Settings")
+        return
+
+    from .stats_dialog import StatsDialog
+
+    # Serve fresh stats straight from the on-disk cache
+    cached_stats, is_fresh = stats_cache.load(username, stats_cache.get_ttl_seconds(config))
+    if cached_stats and is_fresh:
+        dialog = StatsDialog(cached_stats, parent or mw)
+        dialog.exec()
+        return
+
+    # Fetch profile page
+    try:
+        # Joins the deck widget's fetch if one is already running for this trainer
+        stats = stats_service.fetch(username, config, timeout=10)
+        if stats:
+            dialog = StatsDialog(stats, parent or mw)
+            dialog.exec()
+        else:
+            showInfo(f"No stats found for @{username}.\n\nThe profile page layout might have changed, or the username might be incorrect.")
+
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            showInfo(f"Profile not found for username: {username}\n\nPlease check your username in the settings.")
+        else:
+            showInfo(f"HTTP Error {e.code}: {e.reason}")
+    except urllib.error.URLError as e:
+        showInfo(f"Network error: {e.reason}\n\nPlease check your internet connection.")
+    except Exception as e:
+        showInfo(f"Error fetching stats: {str(e)}")
@@ -0,0 +1,82 @@
+"""
+Refresh Scheduler for Focumon Add-on
+Collects widget invalidations from the various hooks (review end, sync, theme
+change, refresh button, settings) and turns each burst into a single action:
+either a cheap re-render from the data already in memory, or one network
+refetch, never more often than the minimum refetch interval allows.
+"""
+
+import time
+
+from aqt.qt import QTimer
+
+# How long to wait for more invalidations before acting, in milliseconds
+DEBOUNCE_MS = 300
+
+# Default minimum time between two non-forced refetches, in seconds
+DEFAULT_MIN_INTERVAL = 60
+
+
+class RefreshScheduler:
+    """
+    Debounces and coalesces refresh requests.
+
+    `rerender` is called to rebuild the widget from cached data, `refetch` to
+    fetch new data. A pending refetch always covers a pending re-render.
+    """
+
+    def __init__(self, rerender, refetch, min_interval=DEFAULT_MIN_INTERVAL):
+        self.rerender = rerender
+        self.refetch = refetch
+        self.min_interval = min_interval
+        self.last_fetch = 0.0
+
+        self.pending_rerender = False
+        self.pending_refetch = False
+        self.pending_force = False
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+
+    def request_rerender(self):
+        """Re-render from cached data (e.g. after a theme change)."""
+        self.pending_rerender = True
+        self._schedule(DEBOUNCE_MS)
+
+    def request_refetch(self, force=False):
+        """
+        Fetch fresh data. Non-forced requests inside the minimum interval are
+        deferred until the interval has passed rather than dropped.
+        """
+        self.pending_refetch = True
+        self.pending_force = self.pending_force or force
+        self._schedule(DEBOUNCE_MS)
+
+    def mark_fetched(self):
+        """Record a fetch that happened outside the scheduler (e.g. on first render)."""
+        self.last_fetch = time.monotonic()
+
+    def _schedule(self, delay_ms):
+        # Restarting the timer on every request is what coalesces a burst
+        self.timer.start(int(delay_ms))
+
+    def flush(self):
+        if self.pending_refetch:
+            wait = self.min_interval - (time.monotonic() - self.last_fetch)
+            if wait > 0 and not self.pending_force:
+                # Too soon: serve a pending re-render now, fetch when allowed
+                if self.pending_rerender:
+                    self.pending_rerender = False
+                    self.rerender()
+                self._schedule(wait * 1000)
+                return
+
+            self.pending_refetch = False
+            self.pending_force = False
+            self.pending_rerender = False
+            self.mark_fetched()
+            self.refetch()
+        elif self.pending_rerender:
+            self.pending_rerender = False
+            self.rerender()
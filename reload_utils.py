@@ -11,22 +11,39 @@ import sys
 
 def reload_modules():
     """
-    Reload settings, stats_dialog, and deck_widget modules.
+    Reload the add-on's modules that have been imported so far.
     This allows changes to be reflected without restarting Anki.
     """
     try:
         # Get the package name
         package_name = __name__.rsplit('.', 1)[0]  # Gets 'Focumon' or the addon folder name
         
-        # List of modules to reload
+        # Dependencies come before the modules that import names from them,
+        # so e.g. deck_widget binds the reloaded RefreshScheduler and
+        # stats_service the reloaded ProfileStats
         modules_to_reload = [
-            'settings',
-            'stats_dialog', 
+            'models',
+            'scrapers',
+            'http_client',
+            'sprite_store',
+            'stats_cache',
+            'stats_service',
+            'refresh_scheduler',
+            'stats_poller',
+            'font_utils',
             'deck_widget',
-            'scrapers',  # Also reload scrapers as it's used by deck_widget
-            'font_utils'  # Reload font utils as well
+            'settings',
+            'stats_dialog',
+            'profile_sync',
+            'timings_dialog',
         ]
         
+        # The old widget module would otherwise keep its hooks registered
+        # and its timers running next to the reloaded one
+        deck_widget_module = sys.modules.get(f"{package_name}.deck_widget")
+        if deck_widget_module and hasattr(deck_widget_module, 'unregister'):
+            deck_widget_module.unregister()
+        
         for module_name in modules_to_reload:
             full_module_name = f"{package_name}.{module_name}"
             
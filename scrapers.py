@@ -1,4 +1,6 @@
+import codecs
 import re
+from typing import NamedTuple, Optional
 
 def extract_username_from_dashboard(html_content):
     """
@@ -47,9 +49,10 @@ def extract_focumon_name(html_content):
     """
     # Look for the second tooltip (first is trainer, second is Focumon)
     # Pattern: data-tip="Hemling"
-    tooltips = re.findall(r'data-tip="([^"]+)"', html_content)
-    if len(tooltips) >= 2:
-        return tooltips[1]  # Second tooltip is the Focumon
+    tooltips = re.finditer(r'data-tip="([^"]+)"', html_content)
+    for index, match in enumerate(tooltips):
+        if index == 1:
+            return match.group(1)  # Second tooltip is the Focumon
     return None
 
 def extract_sprite_urls(html_content):
@@ -70,3 +73,151 @@ def extract_sprite_urls(html_content):
         sprites['focumon_sprite'] = focumon_match.group(1)
     
     return sprites
+
+
+class Profile(NamedTuple):
+    """Fields scraped from a trainer profile page. Missing fields are None."""
+    trainer_level: Optional[str] = None
+    focumon_level: Optional[str] = None
+    focudex_progress: Optional[str] = None
+    focumon_name: Optional[str] = None
+    trainer_sprite: Optional[str] = None
+    focumon_sprite: Optional[str] = None
+
+    def sprite_urls(self):
+        """Same shape as extract_sprite_urls()."""
+        return {
+            key: value for key, value in
+            (('trainer_sprite', self.trainer_sprite), ('focumon_sprite', self.focumon_sprite))
+            if value is not None
+        }
+
+
+# Each field is located with str.find() on a literal marker and only then
+# matched in place. An alternation of patterns with no common prefix would be
+# tried at every position of the page; find() skips the text in between at C
+# speed, which matters when the header comes late in a large page.
+# (field, marker, pattern, occurrences wanted)
+PROFILE_FIELDS = (
+    ('level', '<div class="badge', re.compile(r'<div class="badge[^>]*">LV\.(\d+)</div>'), 2),
+    ('focudex', '<span>Focudex</span>', re.compile(r'<span>Focudex</span>\s*<span>([\d/]+)</span>'), 1),
+    ('tip', 'data-tip="', re.compile(r'data-tip="([^"]+)"'), 2),
+    ('trainer_sprite', 'src="/assets/trainer/battle/',
+     re.compile(r'src="(/assets/trainer/battle/[^"]+\.png)"'), 1),
+    ('focumon_sprite', 'src="/assets/focumon/battle/',
+     re.compile(r'src="(/assets/focumon/battle/[^"]+\.png)"'), 1),
+)
+
+# Longest token we expect; this much text is carried over between chunks
+MAX_TOKEN_LENGTH = 2048
+
+
+class ProfileParser:
+    """
+    Incremental parser for trainer profile pages.
+    Feed it text as it arrives and stop reading once `done` is True.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._buffer = ""
+        self._found = {field: [] for field, _, _, _ in PROFILE_FIELDS}
+        # [field, marker, pattern, wanted, position in the buffer to resume
+        # searching from] for every field still missing
+        self._pending = [[field, marker, pattern, wanted, 0]
+                         for field, marker, pattern, wanted in PROFILE_FIELDS]
+
+    @property
+    def done(self):
+        """True once every field has been found."""
+        return not self._pending
+
+    def feed(self, text):
+        if self.done:
+            return
+        self._buffer += text
+        keep_from = self._scan()
+        cut = max(keep_from, len(self._buffer) - MAX_TOKEN_LENGTH)
+        self._buffer = self._buffer[cut:]
+        for search in self._pending:
+            search[4] = max(search[4] - cut, 0)
+
+    def feed_bytes(self, chunk):
+        """
+        Feed raw response bytes (decoded as UTF-8 across chunk boundaries).
+        Returns True once every field has been found, so it can be used
+        directly as a streaming consumer.
+        """
+        self.feed(self._decoder.decode(chunk))
+        return self.done
+
+    def close(self):
+        """Finish parsing and return the Profile."""
+        if not self.done:
+            # Nothing more is coming, so a marker that doesn't match now never will
+            self._buffer += self._decoder.decode(b"", final=True)
+            self._scan(at_eof=True)
+        self._buffer = ""
+        return self.result()
+
+    def result(self):
+        found = self._found
+
+        def nth(field, index):
+            values = found[field]
+            return values[index] if len(values) > index else None
+
+        return Profile(
+            trainer_level=nth('level', 0),
+            focumon_level=nth('level', 1),
+            focudex_progress=nth('focudex', 0),
+            focumon_name=nth('tip', 1),  # Second tooltip is the Focumon
+            trainer_sprite=nth('trainer_sprite', 0),
+            focumon_sprite=nth('focumon_sprite', 0),
+        )
+
+    def _scan(self, at_eof=False):
+        """
+        Match every complete field in the buffer; returns where unfinished fields resume.
+        With `at_eof`, the buffer holds the end of the page and nothing waits for more text.
+        """
+        buffer = self._buffer
+        keep_from = len(buffer)
+        for search in self._pending[:]:
+            field, marker, pattern, wanted, position = search
+            found = self._found[field]
+            while True:
+                at = buffer.find(marker, position)
+                if at < 0:
+                    # The marker itself may be split across chunks
+                    position = max(position, len(buffer) - len(marker) + 1)
+                    break
+                match = pattern.match(buffer, at)
+                if match:
+                    found.append(match.group(1).strip())
+                    position = match.end()
+                    if len(found) >= wanted:
+                        break
+                elif not at_eof and len(buffer) - at < MAX_TOKEN_LENGTH:
+                    # Possibly cut off at the end of the chunk; retry with more text
+                    position = at
+                    break
+                else:
+                    position = at + 1
+
+            if len(found) >= wanted:
+                self._pending.remove(search)
+            else:
+                search[4] = position
+                keep_from = min(keep_from, position)
+        return keep_from
+
+
+def parse_profile(html_content):
+    """
+    Extract every profile field from the document, stopping as soon as
+    all of them have been found.
+    """
+    parser = ProfileParser()
+    parser.feed(html_content)
+    return parser.close()
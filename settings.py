@@ -2,6 +2,18 @@ from aqt import mw
 from aqt.qt import *
 from aqt.utils import showInfo
 import os
+from . import instrumentation
+
+# Embedded browser HTTP cache options: (label, config value)
+BROWSER_CACHE_MODES = [
+    ("In Memory", "memory"),
+    ("On Disk", "disk"),
+    ("Off", "off"),
+]
+BROWSER_CACHE_EVICTION = [
+    ("Least Recently Used", "lru"),
+    ("Clear on Start", "clear_on_start"),
+]
 
 class ToggleSwitch(QCheckBox):
     """Custom animated toggle switch widget"""
@@ -76,6 +88,7 @@ class ToggleSwitch(QCheckBox):
         painter.drawEllipse(thumb_rect)
 
 class SettingsDialog(QDialog):
+    @instrumentation.timed("SettingsDialog.__init__")
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Focumon Settings")
@@ -206,6 +219,25 @@ class SettingsDialog(QDialog):
                 border-color: {accent_color};
                 outline: none;
             }}
+            QComboBox, QSpinBox {{
+                border: 1px solid {input_border};
+                border-radius: 8px;
+                padding: 4px 10px;
+                font-size: 13px;
+                background-color: {input_bg};
+                color: {text_color};
+                min-height: 24px;
+                font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+            }}
+            QComboBox:focus, QSpinBox:focus {{
+                border-color: {accent_color};
+            }}
+            QComboBox QAbstractItemView {{
+                background-color: {input_bg};
+                color: {text_color};
+                selection-background-color: {accent_color};
+                selection-color: #000000;
+            }}
             QFrame#username-container {{
                 background-color: {stat_bg};
                 border-radius: 12px;
@@ -306,6 +338,81 @@ class SettingsDialog(QDialog):
         hide_widget_layout.addWidget(self.hide_widget_toggle)
         
         main_layout.addLayout(hide_widget_layout)
+
+        # Per-Profile Username Section (for machines shared by several students)
+        per_profile_layout = QHBoxLayout()
+        per_profile_layout.setSpacing(12)
+        
+        per_profile_label = QLabel("Username Per Profile")
+        per_profile_label.setProperty("class", "section-title")
+        per_profile_label.setMinimumHeight(28)
+        per_profile_label.setToolTip("Give each Anki profile its own Focumon username")
+        
+        self.per_profile_toggle = ToggleSwitch()
+        self.per_profile_toggle.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.per_profile_toggle.toggled.connect(self.update_username_field)
+        
+        per_profile_layout.addWidget(per_profile_label)
+        per_profile_layout.addStretch()
+        per_profile_layout.addWidget(self.per_profile_toggle)
+        
+        main_layout.addLayout(per_profile_layout)
+
+        # Browser Cache Section
+        cache_mode_layout = QHBoxLayout()
+        cache_mode_layout.setSpacing(12)
+        
+        cache_mode_label = QLabel("Browser Cache")
+        cache_mode_label.setProperty("class", "section-title")
+        cache_mode_label.setMinimumHeight(28)
+        
+        self.cache_mode_combo = QComboBox()
+        for label, value in BROWSER_CACHE_MODES:
+            self.cache_mode_combo.addItem(label, value)
+        self.cache_mode_combo.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.cache_mode_combo.currentIndexChanged.connect(self.update_cache_controls)
+        
+        cache_mode_layout.addWidget(cache_mode_label)
+        cache_mode_layout.addStretch()
+        cache_mode_layout.addWidget(self.cache_mode_combo)
+        
+        main_layout.addLayout(cache_mode_layout)
+
+        cache_size_layout = QHBoxLayout()
+        cache_size_layout.setSpacing(12)
+        
+        cache_size_label = QLabel("Max Cache Size")
+        cache_size_label.setProperty("class", "section-title")
+        cache_size_label.setMinimumHeight(28)
+        
+        self.cache_size_spin = QSpinBox()
+        self.cache_size_spin.setRange(10, 2000)
+        self.cache_size_spin.setSingleStep(10)
+        self.cache_size_spin.setSuffix(" MB")
+        
+        cache_size_layout.addWidget(cache_size_label)
+        cache_size_layout.addStretch()
+        cache_size_layout.addWidget(self.cache_size_spin)
+        
+        main_layout.addLayout(cache_size_layout)
+
+        cache_eviction_layout = QHBoxLayout()
+        cache_eviction_layout.setSpacing(12)
+        
+        cache_eviction_label = QLabel("Cache Cleanup")
+        cache_eviction_label.setProperty("class", "section-title")
+        cache_eviction_label.setMinimumHeight(28)
+        
+        self.cache_eviction_combo = QComboBox()
+        for label, value in BROWSER_CACHE_EVICTION:
+            self.cache_eviction_combo.addItem(label, value)
+        self.cache_eviction_combo.setCursor(Qt.CursorShape.PointingHandCursor)
+        
+        cache_eviction_layout.addWidget(cache_eviction_label)
+        cache_eviction_layout.addStretch()
+        cache_eviction_layout.addWidget(self.cache_eviction_combo)
+        
+        main_layout.addLayout(cache_eviction_layout)
         
         main_layout.addSpacing(16)
         
@@ -368,10 +475,54 @@ class SettingsDialog(QDialog):
 
     def load_settings(self):
         config = mw.addonManager.getConfig(__name__)
+        self.shared_username = ""
+        self.profile_usernames = {}
+        self.username_per_profile = None
         if config:
             self.always_on_top_toggle.setChecked(config.get("always_on_top", False))
             self.hide_widget_toggle.setChecked(config.get("hide_deck_widget", False))
-            self.username_input.setText(config.get("focumon_username", ""))
+            # The field edits either the shared username or this profile's own one
+            self.shared_username = config.get("focumon_username", "")
+            self.profile_usernames = dict(config.get("profile_usernames") or {})
+            self.per_profile_toggle.setChecked(config.get("per_profile_username", False))
+            self.update_username_field(self.per_profile_toggle.isChecked())
+            self.set_combo_value(self.cache_mode_combo, config.get("browser_cache_mode", "memory"))
+            self.set_combo_value(self.cache_eviction_combo, config.get("browser_cache_eviction", "lru"))
+            try:
+                self.cache_size_spin.setValue(int(config.get("browser_cache_max_mb", 100)))
+            except (TypeError, ValueError):
+                self.cache_size_spin.setValue(100)
+        self.update_cache_controls()
+
+    def update_username_field(self, per_profile):
+        """Swap the username field between the shared and the per-profile value."""
+        if not hasattr(self, "profile_usernames"):
+            return
+        profile_name = getattr(mw.pm, "name", None)
+        # Keep what was typed for the mode being left
+        if self.username_per_profile is True:
+            self.profile_usernames[profile_name] = self.username_input.text().strip()
+        elif self.username_per_profile is False:
+            self.shared_username = self.username_input.text().strip()
+        
+        self.username_per_profile = per_profile
+        if per_profile:
+            self.username_input.setText(self.profile_usernames.get(profile_name, ""))
+            self.username_input.setPlaceholderText(f"Username for profile \"{profile_name}\"")
+        else:
+            self.username_input.setText(self.shared_username)
+            self.username_input.setPlaceholderText("e.g., FocumonUser")
+
+    def set_combo_value(self, combo, value):
+        index = combo.findData(value)
+        if index != -1:
+            combo.setCurrentIndex(index)
+
+    def update_cache_controls(self):
+        """Cache size and cleanup only apply when the browser cache is enabled / on disk."""
+        mode = self.cache_mode_combo.currentData()
+        self.cache_size_spin.setEnabled(mode != "off")
+        self.cache_eviction_combo.setEnabled(mode == "disk")
 
     def save_settings(self):
         config = mw.addonManager.getConfig(__name__)
@@ -380,7 +531,15 @@ class SettingsDialog(QDialog):
         
         config["always_on_top"] = self.always_on_top_toggle.isChecked()
         config["hide_deck_widget"] = self.hide_widget_toggle.isChecked()
-        config["focumon_username"] = self.username_input.text().strip()
+        self.update_username_field(self.per_profile_toggle.isChecked())
+        config["per_profile_username"] = self.per_profile_toggle.isChecked()
+        config["focumon_username"] = self.shared_username
+        config["profile_usernames"] = {
+            name: username for name, username in self.profile_usernames.items() if username
+        }
+        config["browser_cache_mode"] = self.cache_mode_combo.currentData()
+        config["browser_cache_max_mb"] = self.cache_size_spin.value()
+        config["browser_cache_eviction"] = self.cache_eviction_combo.currentData()
         mw.addonManager.writeConfig(__name__, config)
         
         # If the window is open, update it
@@ -0,0 +1,125 @@
+"""
+Sprite Store for Focumon Add-on
+Content-addressed on-disk cache for sprite PNGs. Focumon asset paths carry a
+content hash (e.g. /assets/focumon/battle/098-b0350d43.png), so a file that is
+already on disk never needs to be downloaded again.
+"""
+
+import os
+import threading
+
+from . import http_client
+
+SPRITE_DIR = os.path.join(os.path.dirname(__file__), "user_files", "sprites")
+
+# Default upper bound for the sprite folder, in megabytes
+DEFAULT_MAX_MB = 5
+
+_lock = threading.Lock()
+
+
+def get_max_bytes(config):
+    """Read the sprite cache size limit from the add-on config."""
+    max_mb = DEFAULT_MAX_MB
+    if config:
+        try:
+            max_mb = float(config.get("sprite_cache_max_mb", DEFAULT_MAX_MB))
+        except (TypeError, ValueError):
+            pass
+    return int(max(0.0, max_mb) * 1024 * 1024)
+
+
+def sprite_filename(asset_path):
+    """
+    Map an asset path to its file name in the store.
+    /assets/trainer/battle/059-d662f48e.png -> trainer-battle-059-d662f48e.png
+    """
+    parts = [p for p in asset_path.split("/") if p and p != "assets"]
+    return "-".join(parts)
+
+
+def sprite_path(asset_path):
+    return os.path.join(SPRITE_DIR, sprite_filename(asset_path))
+
+
+def get(asset_path):
+    """Return cached sprite bytes, or None. A hit refreshes the file's LRU timestamp."""
+    path = sprite_path(asset_path)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def put(asset_path, data, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+    """Store sprite bytes under their content-addressed name, then enforce the size cap."""
+    path = sprite_path(asset_path)
+    try:
+        os.makedirs(SPRITE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Focumon: failed to store sprite: {e}")
+        return
+
+    evict(max_bytes, keep=path)
+
+
+def evict(max_bytes, keep=None):
+    """Delete least recently used sprites until the folder fits in max_bytes."""
+    with _lock:
+        try:
+            entries = []
+            for name in os.listdir(SPRITE_DIR):
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(SPRITE_DIR, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def fetch_sprites(sprite_urls, timeout=3, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+    """
+    Resolve scraped sprite paths to image bytes, downloading only the ones not on disk.
+    `sprite_urls` is the dict from scrapers.extract_sprite_urls; returns
+    {'trainer_sprite_data': bytes, 'focumon_sprite_data': bytes} for what's available.
+    """
+    results = {}
+    missing = {}
+    for key, asset_path in sprite_urls.items():
+        data = get(asset_path)
+        if data is not None:
+            results[f"{key}_data"] = data
+        else:
+            missing[f"{key}_data"] = asset_path
+
+    if missing:
+        downloaded = http_client.get_many(missing, timeout=timeout)
+        for field, data in downloaded.items():
+            put(missing[field], data, max_bytes)
+        results.update(downloaded)
+
+    return results
@@ -0,0 +1,132 @@
+"""
+Persistent Stats Cache for Focumon Add-on
+Keeps the last fetched profile stats on disk (in the add-on's user_files folder)
+so the deck browser can render instantly after an Anki restart.
+"""
+
+import os
+import re
+import json
+import hashlib
+import time
+
+from . import sprite_store
+from .models import ProfileStats
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "user_files", "stats_cache")
+
+# Default time-to-live for cached stats, in minutes
+DEFAULT_TTL_MINUTES = 15
+
+
+def get_ttl_seconds(config):
+    """Read the cache TTL from the add-on config."""
+    minutes = DEFAULT_TTL_MINUTES
+    if config:
+        try:
+            minutes = float(config.get("stats_cache_ttl_minutes", DEFAULT_TTL_MINUTES))
+        except (TypeError, ValueError):
+            pass
+    return max(0.0, minutes) * 60
+
+
+def _cache_key(username):
+    """
+    Turn a username into a safe file name stem. The readable part is lossy
+    ("a.b" and "a_b" both become "a_b"), so a hash of the name keeps them apart.
+    """
+    name = username.strip().lower()
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+    return f"{re.sub(r'[^a-z0-9_-]', '_', name)}-{digest}"
+
+
+def _entry_path(username, suffix):
+    return os.path.join(CACHE_DIR, f"{_cache_key(username)}{suffix}")
+
+
+def _write_atomic(path, data):
+    """Write bytes to a temp file and move it into place so readers never see partial files."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read_entry(username):
+    try:
+        with open(_entry_path(username, ".json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _load_sprite(asset_path):
+    return sprite_store.get(asset_path) if asset_path else None
+
+
+def load(username, ttl_seconds):
+    """
+    Load cached stats for a username.
+    Returns (stats, is_fresh); stats is a ProfileStats, or None if nothing is cached.
+    """
+    if not username:
+        return None, False
+
+    entry = _read_entry(username)
+    if entry is None:
+        return None, False
+
+    # Sprite bytes are not stored in the entry; they are resolved from the
+    # content-addressed sprite store using the asset paths
+    data = entry.get("stats") or {}
+    stats = ProfileStats.from_json(
+        data,
+        trainer_sprite_data=_load_sprite(data.get("trainer_sprite")),
+        focumon_sprite_data=_load_sprite(data.get("focumon_sprite")),
+    )
+
+    age = time.time() - entry.get("fetched_at", 0)
+    return stats, age <= ttl_seconds
+
+
+def is_fresh(username, ttl_seconds):
+    """True if a cached entry exists and is younger than the TTL, without loading sprites."""
+    entry = _read_entry(username) if username else None
+    return entry is not None and time.time() - entry.get("fetched_at", 0) <= ttl_seconds
+
+
+def load_validators(username):
+    """Return the HTTP validators (ETag / Last-Modified) stored with the entry, if any."""
+    entry = _read_entry(username) if username else None
+    return entry.get("validators") if entry else None
+
+
+def touch(username):
+    """Mark an entry as freshly fetched, e.g. after a 304 Not Modified."""
+    entry = _read_entry(username) if username else None
+    if entry is None:
+        return
+
+    entry["fetched_at"] = time.time()
+    try:
+        _write_atomic(_entry_path(username, ".json"), json.dumps(entry).encode("utf-8"))
+    except OSError as e:
+        print(f"Focumon: failed to write stats cache: {e}")
+
+
+def save(username, stats, validators=None):
+    """Persist a ProfileStats for a username. Failures are logged and otherwise ignored."""
+    if not username or stats is None:
+        return
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        entry = {
+            "fetched_at": time.time(),
+            "stats": stats.to_json(),
+            "validators": validators or {},
+        }
+        _write_atomic(_entry_path(username, ".json"), json.dumps(entry).encode("utf-8"))
+    except OSError as e:
+        print(f"Focumon: failed to write stats cache: {e}")
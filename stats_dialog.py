@@ -1,9 +1,9 @@
 from aqt.qt import *
 
 class StatsDialog(QDialog):
-    def __init__(self, stats_data, parent=None):
+    def __init__(self, stats, parent=None):
         super().__init__(parent)
-        self.stats_data = stats_data
+        self.stats = stats
         self.setWindowTitle("Focumon Stats")
         self.resize(400, 420)
         self.setup_ui()
@@ -103,7 +103,7 @@ class StatsDialog(QDialog):
         layout.addWidget(title)
         
         # Username
-        username = self.stats_data.get('username', '')
+        username = self.stats.username
         if username:
             username_label = QLabel(f"@{username}")
             username_label.setObjectName("username")
@@ -113,7 +113,7 @@ class StatsDialog(QDialog):
         layout.addSpacing(14)
         
         # Sprites (Trainer and Focumon side by side with overlap)
-        if 'trainer_sprite_data' in self.stats_data or 'focumon_sprite_data' in self.stats_data:
+        if self.stats.trainer_sprite_data is not None or self.stats.focumon_sprite_data is not None:
             sprite_container = QWidget()
             sprite_container.setFixedHeight(150)
             sprite_container.setStyleSheet("background: transparent;")
@@ -129,20 +129,20 @@ class StatsDialog(QDialog):
             sprites_widget.setFixedSize(240, 150)  # Increased size to prevent clipping
             
             # Trainer sprite
-            if 'trainer_sprite_data' in self.stats_data:
+            if self.stats.trainer_sprite_data is not None:
                 trainer_label = QLabel(sprites_widget)
                 pixmap = QPixmap()
-                if pixmap.loadFromData(self.stats_data['trainer_sprite_data']):
+                if pixmap.loadFromData(self.stats.trainer_sprite_data):
                     # Use actual size (128x128) for pixelated look
                     scaled = pixmap.scaled(128, 128, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
                     trainer_label.setPixmap(scaled)
                     trainer_label.setGeometry(10, 10, 128, 128)  # Position at left with margin
             
             # Focumon sprite (overlapping)
-            if 'focumon_sprite_data' in self.stats_data:
+            if self.stats.focumon_sprite_data is not None:
                 focumon_label = QLabel(sprites_widget)
                 pixmap = QPixmap()
-                if pixmap.loadFromData(self.stats_data['focumon_sprite_data']):
+                if pixmap.loadFromData(self.stats.focumon_sprite_data):
                     # Use actual size (128x128) for pixelated look
                     scaled = pixmap.scaled(128, 128, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
                     focumon_label.setPixmap(scaled)
@@ -156,25 +156,26 @@ class StatsDialog(QDialog):
         layout.addSpacing(10)
         
         # Trainer Level
-        if 'trainer_level' in self.stats_data:
-            self._add_stat_row(layout, "Trainer Level", f"LV.{self.stats_data['trainer_level']}")
+        if self.stats.trainer_level is not None:
+            self._add_stat_row(layout, "Trainer Level", f"LV.{self.stats.trainer_level}")
             layout.addSpacing(8)
         
         # Focumon Level
-        if 'focumon_level' in self.stats_data:
-            self._add_stat_row(layout, "Focumon Level", f"LV.{self.stats_data['focumon_level']}")
+        if self.stats.focumon_level is not None:
+            self._add_stat_row(layout, "Focumon Level", f"LV.{self.stats.focumon_level}")
             layout.addSpacing(8)
         
         # Focumon Name
-        if 'focumon_name' in self.stats_data:
-            self._add_stat_row(layout, "Current Focumon", self.stats_data['focumon_name'])
+        if self.stats.focumon_name:
+            self._add_stat_row(layout, "Current Focumon", self.stats.focumon_name)
             layout.addSpacing(8)
         
         layout.addSpacing(10)
         
         # Focudex Progress with progress bar (if available)
-        if 'focudex_progress' in self.stats_data:
-            self._add_progress_stat(layout, "Focudex Progress", self.stats_data['focudex_progress'])
+        if self.stats.focudex_current is not None:
+            self._add_progress_stat(layout, "Focudex Progress",
+                                    self.stats.focudex_current, self.stats.focudex_total)
         
         # Close button
         close_btn = QPushButton("Close")
@@ -202,36 +203,19 @@ class StatsDialog(QDialog):
 
 
 
-    def _add_progress_stat(self, layout, label_text, value_text):
-        """Add a stat with progress bar (e.g., '50/100')"""
+    def _add_progress_stat(self, layout, label_text, current, maximum):
+        """Add a stat with progress bar (e.g., 50 of 100)"""
         # Label
         label = QLabel(label_text)
         label.setObjectName("statLabel")
         layout.addWidget(label)
         
-        # Parse value like "50/100" or "273/360"
-        try:
-            parts = value_text.split('/')
-            if len(parts) == 2:
-                current = int(parts[0])
-                maximum = int(parts[1])
-                
-                # Progress bar
-                progress = QProgressBar()
-                progress.setMinimum(0)
-                progress.setMaximum(maximum)
-                progress.setValue(current)
-                progress.setFormat(f"{current}/{maximum}")
-                layout.addWidget(progress)
-            else:
-                # Fallback to simple display
-                value = QLabel(value_text)
-                value.setObjectName("statValue")
-                layout.addWidget(value)
-        except:
-            # Fallback to simple display
-            value = QLabel(value_text)
-            value.setObjectName("statValue")
-            layout.addWidget(value)
+        # Progress bar
+        progress = QProgressBar()
+        progress.setMinimum(0)
+        progress.setMaximum(maximum)
+        progress.setValue(current)
+        progress.setFormat(f"{current}/{maximum}")
+        layout.addWidget(progress)
         
         layout.addSpacing(8)
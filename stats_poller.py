@@ -0,0 +1,84 @@
+"""
+Stats Poller for Focumon Add-on
+Optionally refreshes the widget's stats in the background on a timer, so the
+deck browser always has recent data without fetching at render time. Backs off
+exponentially while fetches fail and pauses while the reviewer is active.
+"""
+
+import time
+
+from aqt.qt import QTimer
+
+# While paused (e.g. during reviews), check again this often, in seconds
+PAUSE_RECHECK_SECONDS = 60
+
+# Failed polls wait up to this many times the normal interval
+MAX_BACKOFF_FACTOR = 16
+
+
+class StatsPoller:
+    """
+    Drives periodic background fetches.
+
+    `fetch(on_complete)` starts a fetch and returns False if it could not
+    (e.g. one is already running); it later calls on_complete(success).
+    `get_interval()` returns the poll interval in seconds, 0 to disable.
+    `is_paused()` returns True while polling should wait.
+    `last_fetch()` returns the time.monotonic() of the most recent fetch from any source.
+    """
+
+    def __init__(self, fetch, get_interval, is_paused, last_fetch):
+        self.fetch = fetch
+        self.get_interval = get_interval
+        self.is_paused = is_paused
+        self.last_fetch = last_fetch
+        self.failures = 0
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+
+    def reconfigure(self):
+        """(Re)start or stop polling after the interval setting changed."""
+        self.failures = 0
+        interval = self.get_interval()
+        if interval > 0:
+            self._schedule(interval)
+        else:
+            self.timer.stop()
+
+    def backoff_delay(self, interval):
+        factor = min(2 ** self.failures, MAX_BACKOFF_FACTOR)
+        return interval * factor
+
+    def _schedule(self, seconds):
+        self.timer.start(int(max(seconds, 1) * 1000))
+
+    def tick(self):
+        interval = self.get_interval()
+        if interval <= 0:
+            return
+
+        if self.is_paused():
+            self._schedule(min(interval, PAUSE_RECHECK_SECONDS))
+            return
+
+        # Something else fetched recently; no need to poll yet
+        since_last = time.monotonic() - self.last_fetch()
+        if not self.failures and since_last < interval:
+            self._schedule(interval - since_last)
+            return
+
+        if not self.fetch(self.on_complete):
+            self._schedule(interval)
+
+    def on_complete(self, success):
+        if success:
+            self.failures = 0
+        else:
+            self.failures += 1
+            print(f"Focumon: background poll failed, backing off ({self.failures})")
+
+        interval = self.get_interval()
+        if interval > 0:
+            self._schedule(self.backoff_delay(interval))
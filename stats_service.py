@@ -0,0 +1,205 @@
+"""
+Stats Fetch Service for Focumon Add-on
+The one pipeline that turns a username into ProfileStats: revalidate against the
+cached entry, stream the profile page into the parser, resolve sprites and save
+the result. Used by both the deck widget and the Profile dialog.
+
+Fetches are single-flight: while a fetch for a username is running, other
+callers for the same username wait for it and share its result instead of
+requesting the page again. Listeners are told about every completed fetch, so
+a fetch started by one entry point also updates the other.
+"""
+
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from . import scrapers
+from . import stats_cache
+from . import http_client
+from . import sprite_store
+from . import instrumentation
+from .models import ProfileStats
+
+# Sprite downloads never wait longer than this, in seconds
+SPRITE_TIMEOUT = 5
+
+# Trainer pages prefetched at the same time
+PREFETCH_WORKERS = 3
+
+
+class _Call:
+    """A fetch in progress; followers wait on `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_in_flight = {}
+_lock = threading.Lock()
+
+# Called as listener(username, stats) on the fetching thread after each successful fetch
+listeners = []
+
+_prefetch_executor = None
+_prefetch_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=PREFETCH_WORKERS, thread_name_prefix="focumon-prefetch")
+        return _prefetch_executor
+
+
+def get_username(config, profile_name=None):
+    """
+    The Focumon username for an Anki profile. With per_profile_username on,
+    each profile uses its own entry in profile_usernames (empty if unmapped);
+    otherwise every profile shares focumon_username.
+    """
+    if not config:
+        return ""
+    if config.get("per_profile_username", False):
+        usernames = config.get("profile_usernames") or {}
+        return (usernames.get(profile_name) or "").strip() if profile_name else ""
+    return config.get("focumon_username", "").strip()
+
+
+def get_all_usernames(config):
+    """Every distinct username configured on this machine."""
+    if not config:
+        return []
+    if config.get("per_profile_username", False):
+        names = (config.get("profile_usernames") or {}).values()
+    else:
+        names = [config.get("focumon_username", "")]
+    usernames = []
+    for name in names:
+        name = (name or "").strip()
+        if name and name.lower() not in (u.lower() for u in usernames):
+            usernames.append(name)
+    return usernames
+
+
+def _fetch(username, timeout, max_sprite_bytes):
+    path = f"/trainers/{urllib.parse.quote(username)}"
+
+    # Revalidate against the previous response; a 304 skips parsing entirely.
+    # The page is streamed into the parser and the download stops as soon
+    # as every field has been seen.
+    parser = scrapers.ProfileParser()
+    parse_seconds = [0.0]
+
+    def consume(chunk):
+        # Parsing runs inside the body download; time it separately
+        started = time.perf_counter()
+        try:
+            return parser.feed_bytes(chunk)
+        finally:
+            parse_seconds[0] += time.perf_counter() - started
+
+    validators = stats_cache.load_validators(username)
+    modified, validators = http_client.get_streamed(
+        path, consume, validators, timeout=timeout)
+    if not modified:
+        cached_stats, _ = stats_cache.load(username, 0)
+        if cached_stats:
+            stats_cache.touch(username)
+            # The page is unchanged, but a sprite may have been evicted from disk
+            # (or never downloaded); fetch just those instead of dropping them
+            missing = cached_stats.missing_sprite_urls
+            if missing:
+                with instrumentation.span("sprites.fetch", count=len(missing)):
+                    sprites = sprite_store.fetch_sprites(
+                        missing, timeout=min(timeout, SPRITE_TIMEOUT), max_bytes=max_sprite_bytes)
+                cached_stats = cached_stats.with_sprites(sprites)
+            return cached_stats
+        # The entry vanished since the validators were read; fetch unconditionally
+        modified, validators = http_client.get_streamed(path, consume, timeout=timeout)
+    profile = parser.close()
+    instrumentation.record("scrapers.parse", parse_seconds[0], done=parser.done)
+
+    # Sprites already on disk are reused, the rest download concurrently
+    sprites = {}
+    sprite_urls = profile.sprite_urls()
+    if sprite_urls:
+        with instrumentation.span("sprites.fetch", count=len(sprite_urls)):
+            sprites = sprite_store.fetch_sprites(
+                sprite_urls, timeout=min(timeout, SPRITE_TIMEOUT), max_bytes=max_sprite_bytes)
+
+    stats = ProfileStats.from_profile(username, profile, sprites)
+    if not stats.has_stats:
+        return None
+
+    stats_cache.save(username, stats, validators)
+    return stats
+
+
+def fetch(username, config=None, timeout=5):
+    """
+    Fetch stats for a username and return a ProfileStats, or None if the page
+    had no stats. Network errors are raised as urllib HTTPError / URLError;
+    callers that joined an in-flight fetch get the same result or error.
+    Blocks, so call it from a background thread where possible.
+    """
+    if config is not None:
+        http_client.set_base_url(config.get("focumon_base_url"))
+
+    key = username.strip().lower()
+    with _lock:
+        call = _in_flight.get(key)
+        leader = call is None
+        if leader:
+            call = _in_flight[key] = _Call()
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        with instrumentation.span("stats_service.fetch", username=username):
+            call.result = _fetch(username, timeout, sprite_store.get_max_bytes(config))
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            del _in_flight[key]
+        call.done.set()
+
+    for listener in listeners:
+        try:
+            listener(username, call.result)
+        except Exception as e:
+            print(f"Focumon: stats listener failed: {e}")
+    return call.result
+
+
+def _prefetch_one(username, config, timeout):
+    try:
+        fetch(username, config, timeout)
+    except Exception as e:
+        print(f"Focumon: prefetching @{username} failed: {e}")
+
+
+def prefetch(usernames, config=None, timeout=5):
+    """
+    Warm the stats cache for several trainers in the background, at most
+    PREFETCH_WORKERS at a time. Trainers whose cached entry is still fresh are
+    skipped. Returns the futures of the fetches that were started.
+    """
+    ttl = stats_cache.get_ttl_seconds(config)
+    futures = []
+    for username in usernames:
+        if stats_cache.is_fresh(username, ttl):
+            continue
+        futures.append(_get_prefetch_executor().submit(_prefetch_one, username, config, timeout))
+    return futures
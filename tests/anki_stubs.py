@@ -0,0 +1,158 @@
+"""
+Minimal stand-ins for the aqt modules, so the add-on's modules can be imported
+outside Anki by the benchmarks and the fake server.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Package name the add-on is imported under by addon_module()
+ADDON_NAME = "focumon"
+
+# Entries install() puts in sys.modules
+AQT_MODULES = ("aqt", "aqt.qt", "aqt.deckbrowser", "aqt.utils")
+
+_shared_mw = None
+
+
+class _Hook(list):
+    """gui_hooks entries are lists of callbacks."""
+
+
+class _Hooks:
+    def __getattr__(self, name):
+        hook = _Hook()
+        setattr(self, name, hook)
+        return hook
+
+
+class _Signal:
+    def __init__(self):
+        self.callbacks = []
+
+    def connect(self, callback):
+        self.callbacks.append(callback)
+
+
+class QTimer:
+    """Never fires on its own; tests call the connected slot directly."""
+
+    def __init__(self, *args):
+        self.timeout = _Signal()
+        self.interval = None
+
+    def setSingleShot(self, single_shot):
+        pass
+
+    def start(self, msec):
+        self.interval = msec
+
+    def stop(self):
+        self.interval = None
+
+
+class _Menu:
+    """Stands in for QMenu and QAction; records what is added."""
+
+    def __init__(self, *args):
+        self.args = args
+        self.actions = []
+        self.triggered = _Signal()
+
+    def addMenu(self, menu):
+        self.actions.append(menu)
+
+    def addAction(self, action):
+        self.actions.append(action)
+
+    def insertAction(self, before, action):
+        self.actions.insert(self.actions.index(before), action)
+
+    def addSeparator(self):
+        pass
+
+
+def install(config=None):
+    """Register fake aqt modules and return the fake mw."""
+    config = {} if config is None else config
+
+    addon_manager = types.SimpleNamespace(
+        getConfig=lambda module: config,
+        writeConfig=lambda module, new_config: config.update(new_config),
+        addonFromModule=lambda module: module.split(".")[0],
+        setWebExports=lambda module, pattern: None,
+        setConfigUpdatedAction=lambda module, action: None,
+    )
+    mw = types.SimpleNamespace(
+        addonManager=addon_manager,
+        pm=types.SimpleNamespace(name="User 1", night_mode=lambda: False),
+        state="deckBrowser",
+        form=types.SimpleNamespace(menuTools=_Menu()),
+        deckBrowser=types.SimpleNamespace(web=None, refresh=lambda: None),
+        taskman=types.SimpleNamespace(
+            run_in_background=lambda task, on_done: None,
+            run_on_main=lambda callback: callback(),
+        ),
+    )
+
+    aqt = types.ModuleType("aqt")
+    aqt.mw = mw
+    aqt.gui_hooks = _Hooks()
+
+    qt = types.ModuleType("aqt.qt")
+    qt.QTimer = QTimer
+    qt.QMenu = _Menu
+    qt.QAction = _Menu
+    qt.QFontDatabase = None
+    qt.QApplication = None
+
+    deckbrowser = types.ModuleType("aqt.deckbrowser")
+    deckbrowser.DeckBrowser = object
+    deckbrowser.DeckBrowserContent = object
+
+    utils = types.ModuleType("aqt.utils")
+    utils.showInfo = print
+
+    aqt.qt, aqt.deckbrowser, aqt.utils = qt, deckbrowser, utils
+    sys.modules.update({
+        "aqt": aqt,
+        "aqt.qt": qt,
+        "aqt.deckbrowser": deckbrowser,
+        "aqt.utils": utils,
+    })
+    return mw
+
+
+def load_addon(name="focumon"):
+    """
+    Make the add-on importable as package `name` without running its __init__
+    (which builds menus), so e.g. importlib.import_module(f"{name}.deck_widget") works.
+    """
+    package = types.ModuleType(name)
+    package.__path__ = [ADDON_DIR]
+    sys.modules[name] = package
+    return package
+
+
+def shared_mw():
+    """
+    The fake mw shared by every test module. The stubs and the add-on package
+    are installed on first use only, so add-on modules imported from different
+    test files all bind the same aqt, whatever order the files run in.
+    Its config dict is returned by getConfig(), so tests can edit it in place.
+    """
+    global _shared_mw
+    if _shared_mw is None:
+        _shared_mw = install()
+        load_addon(ADDON_NAME)
+    return _shared_mw
+
+
+def addon_module(name):
+    """Import the add-on module `name` against the shared stubs."""
+    shared_mw()
+    return importlib.import_module(f"{ADDON_NAME}.{name}")
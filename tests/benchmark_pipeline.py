@@ -0,0 +1,177 @@
+"""
+Benchmarks for the scrape -> render pipeline.
+
+Runs offline against the trainer page in tests/fixtures, with the Anki modules
+stubbed out, and reports the time and memory each stage costs per call:
+
+    python tests/benchmark_pipeline.py
+    python tests/benchmark_pipeline.py --inflate 1,10,50 --number 200
+
+Besides the page as recorded, inflated copies repeat the Focudex grid. In the
+"late" copies the extra grids come before the profile header, which is the
+worst case for the streaming parser because it has to read almost everything.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from anki_stubs import addon_module
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Stand-in sprite bytes; generate_html only base64-encodes them
+SPRITE_BYTES = bytes(range(256)) * 8
+
+GRID_START = '<section class="w-full mt-8">'
+GRID_END = '</section>\n'
+MAIN_START = '<main class="container mx-auto px-4 py-6 flex flex-col md:flex-row gap-6">\n'
+
+
+def load_page():
+    with open(os.path.join(FIXTURES_DIR, "trainer_profile.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def inflate(page, factor, late=False):
+    """Repeat the Focudex grid so the page is roughly `factor` times larger."""
+    start = page.index(GRID_START)
+    end = page.index(GRID_END, start) + len(GRID_END)
+    extra = page[start:end] * (factor - 1)
+    if late:
+        at = page.index(MAIN_START) + len(MAIN_START)
+        return page[:at] + extra + page[at:]
+    return page[:end] + extra + page[end:]
+
+
+def measure(func, number, setup=None, repeat=5):
+    """
+    Best time per call over `repeat` rounds of `number` calls, and the peak
+    memory allocated by one call. `setup` runs untimed before every call.
+    """
+    best = None
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(number):
+            if setup:
+                setup()
+            started = timeit.default_timer()
+            func()
+            elapsed += timeit.default_timer() - started
+        per_call = elapsed / number
+        best = per_call if best is None else min(best, per_call)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def legacy_extract(scrapers, html):
+    """The pre-ProfileParser pipeline: one regex pass per field."""
+    stats = scrapers.extract_levels(html)
+    stats['focudex_progress'] = scrapers.extract_focudex(html)
+    stats['focumon_name'] = scrapers.extract_focumon_name(html)
+    stats.update(scrapers.extract_sprite_urls(html))
+    return stats
+
+
+def stream_parse(scrapers, data, chunk_size):
+    """Feed the page the way http_client streams it, stopping once every field is found."""
+    parser = scrapers.ProfileParser()
+    for i in range(0, len(data), chunk_size):
+        if parser.feed_bytes(data[i:i + chunk_size]):
+            break
+    return parser.close()
+
+
+def scrape_stages(pages, number):
+    scrapers = addon_module("scrapers")
+    http_client = addon_module("http_client")
+    ProfileStats = addon_module("models").ProfileStats
+
+    for label, html in pages:
+        data = html.encode("utf-8")
+        profile = scrapers.parse_profile(html)
+        sprites = {'trainer_sprite_data': SPRITE_BYTES, 'focumon_sprite_data': SPRITE_BYTES}
+        yield "scrapers (legacy extract_*)", label, measure(lambda: legacy_extract(scrapers, html), number)
+        yield "scrapers.parse_profile", label, measure(lambda: scrapers.parse_profile(html), number)
+        yield "ProfileParser.feed_bytes", label, measure(
+            lambda: stream_parse(scrapers, data, http_client.STREAM_CHUNK_SIZE), number)
+        yield "ProfileStats.from_profile", label, measure(
+            lambda: ProfileStats.from_profile("PeaceMonk", profile, sprites), number)
+
+
+def render_stages(page, number):
+    scrapers = addon_module("scrapers")
+    font_utils = addon_module("font_utils")
+    deck_widget = addon_module("deck_widget")
+    ProfileStats = addon_module("models").ProfileStats
+
+    def clear_font_caches():
+        font_utils._font_cache.clear()
+        font_utils._font_face_cache.clear()
+
+    def clear_css_caches():
+        clear_font_caches()
+        deck_widget.css_cache.clear()
+
+    stats = ProfileStats.from_profile("PeaceMonk", scrapers.parse_profile(page), {
+        'trainer_sprite_data': SPRITE_BYTES, 'focumon_sprite_data': SPRITE_BYTES})
+
+    yield "font_utils.get_font_face_css (embedded)", "cold", measure(
+        lambda: font_utils.get_font_face_css(), number, setup=clear_font_caches)
+    yield "font_utils.get_font_face_css (embedded)", "warm", measure(
+        lambda: font_utils.get_font_face_css(), number)
+    yield "font_utils.get_font_face_css (URL)", "cold", measure(
+        lambda: font_utils.get_font_face_css(deck_widget.WEB_BASE), number, setup=clear_font_caches)
+    yield "deck_widget.generate_css", "cold", measure(
+        deck_widget.generate_css, number, setup=clear_css_caches)
+    yield "deck_widget.generate_css", "warm", measure(deck_widget.generate_css, number)
+    yield "deck_widget.generate_html", "stats", measure(
+        lambda: deck_widget.generate_html(stats), number)
+    yield "deck_widget.generate_html", "loading", measure(
+        lambda: deck_widget.generate_html(loading=True), number)
+
+
+def format_row(stage, label, result):
+    per_call, peak = result
+    return f"{stage:<42} {label:<10} {per_call * 1e6:>12.1f} us {peak / 1024:>10.1f} KiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--inflate", default="1,10,50",
+                        help="comma-separated page size multipliers (default: 1,10,50)")
+    parser.add_argument("--number", type=int, default=50,
+                        help="calls per timing round (default: 50)")
+    args = parser.parse_args(argv)
+
+    page = load_page()
+    pages = []
+    for factor in (int(value) for value in args.inflate.split(",")):
+        if factor <= 1:
+            pages.append(("x1", page))
+        else:
+            pages.append((f"x{factor}", inflate(page, factor)))
+            pages.append((f"x{factor}-late", inflate(page, factor, late=True)))
+
+    print(f"{'stage':<42} {'input':<10} {'per call':>15} {'peak alloc':>14}")
+    for label, html in pages:
+        print(f"# {label}: {len(html.encode('utf-8')) / 1024:.0f} KiB")
+    for row in scrape_stages(pages, args.number):
+        print(format_row(*row))
+    for row in render_stages(page, args.number):
+        print(format_row(*row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Local stand-in for focumon.com.
+
+Serves the recorded trainer page and a sprite from tests/fixtures, with ETag
+revalidation like the real site, and can inject latency and failures so fetch
+timeouts, caching and concurrency can be tested on an offline machine.
+
+In tests:
+
+    with FakeFocumon() as server:
+        server.set_fault("500", "/trainers/")
+        http_client.set_base_url(server.url)
+
+By hand, then set "focumon_base_url" in the add-on config to the printed URL:
+
+    python tests/fake_focumon.py --port 8765 --latency 0.5
+    python tests/fake_focumon.py --fault drip --path /trainers/
+
+Faults (applied to every path starting with the given prefix):
+    latency    wait `delay` seconds before answering
+    404, 500   answer with that status
+    truncated  announce the full Content-Length but close after half the body
+    drip       send the body `chunk_size` bytes at a time, `delay` seconds apart
+"""
+
+import argparse
+import hashlib
+import http.server
+import os
+import sys
+import threading
+import time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+FAULTS = ("latency", "404", "500", "truncated", "drip")
+
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real site
+
+    def log_message(self, format, *args):
+        if self.server.fake.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        fake = self.server.fake
+        path = self.path.split("?", 1)[0]
+        if path.startswith("http://"):
+            # Absolute-form target: we are being used as an HTTP proxy
+            host, _, path = path[len("http://"):].partition("/")
+            path = f"/{path}"
+            fake.proxied.append(host)
+        fake.record(path)
+
+        kind, options = fake.fault_for(path)
+        delay = fake.latency + (options.get("delay", 0.0) if kind == "latency" else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        if kind in ("404", "500"):
+            return self._send_status(int(kind))
+
+        body, content_type = fake.resolve(path)
+        if body is None:
+            return self._send_status(404)
+
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag and kind not in ("truncated", "drip"):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+        if kind == "truncated":
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+        elif kind == "drip":
+            chunk_size = options.get("chunk_size", 512)
+            for i in range(0, len(body), chunk_size):
+                self.wfile.write(body[i:i + chunk_size])
+                self.wfile.flush()
+                time.sleep(options.get("delay", 0.05))
+        else:
+            self.wfile.write(body)
+
+    def _send_status(self, status):
+        body = f"{status} {self.responses[status][0]}".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hang up early on purpose (the streaming parser stops once it
+        # has every field, pooled connections get dropped); that's not an error
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeFocumon:
+    """
+    Threaded local HTTP server that answers like focumon.com.
+    `latency` delays every response; faults are added with set_fault().
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, verbose=False):
+        self.latency = latency
+        self.verbose = verbose
+        self.page = _read_fixture("trainer_profile.html")
+        self.sprite = _read_fixture("sprite.png")
+        self.missing_trainers = set()
+        self.requests = []
+        # Hosts asked for through this server acting as an HTTP proxy
+        self.proxied = []
+        self._faults = []
+        self._lock = threading.Lock()
+
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-focumon", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def set_fault(self, kind, path="/", **options):
+        """Inject a fault for paths starting with `path`; the newest matching fault wins."""
+        if kind not in FAULTS:
+            raise ValueError(f"Unknown fault: {kind}")
+        with self._lock:
+            self._faults.insert(0, (path, kind, options))
+
+    def clear_faults(self):
+        with self._lock:
+            self._faults = []
+
+    def fault_for(self, path):
+        with self._lock:
+            for prefix, kind, options in self._faults:
+                if path.startswith(prefix):
+                    return kind, options
+        return None, {}
+
+    def record(self, path):
+        with self._lock:
+            self.requests.append(path)
+
+    def count(self, prefix):
+        """Requests served so far for paths starting with prefix."""
+        with self._lock:
+            return sum(1 for path in self.requests if path.startswith(prefix))
+
+    def resolve(self, path):
+        """Return (body, content type) for a path, or (None, None) for a 404."""
+        if path.startswith("/trainers/"):
+            if path[len("/trainers/"):].lower() in self.missing_trainers:
+                return None, None
+            return self.page, "text/html; charset=utf-8"
+        if path.startswith(("/assets/trainer/", "/assets/focumon/")) and path.endswith(".png"):
+            return self.sprite, "image/png"
+        return None, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for focumon.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds to wait before every response")
+    parser.add_argument("--fault", choices=FAULTS, help="fault to inject")
+    parser.add_argument("--path", default="/", help="path prefix the fault applies to")
+    parser.add_argument("--delay", type=float, default=0.05,
+                        help="seconds of delay for the latency and drip faults")
+    args = parser.parse_args(argv)
+
+    server = FakeFocumon(args.host, args.port, latency=args.latency, verbose=True)
+    if args.fault:
+        server.set_fault(args.fault, args.path, delay=args.delay)
+    print(f"Serving fake Focumon on {server.url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import unittest
+
+from anki_stubs import addon_module
+import benchmark_pipeline
+
+scrapers = addon_module("scrapers")
+http_client = addon_module("http_client")
+
+# Generous, so only a real regression (not a noisy machine) fails the suite
+MAX_SLOWDOWN = 3
+
+
+class TestParserPerformance(unittest.TestCase):
+    """Smoke check of the benchmark: the profile parser must not fall behind the legacy extractors."""
+
+    def assert_not_slower(self, html):
+        data = html.encode("utf-8")
+        legacy, _ = benchmark_pipeline.measure(
+            lambda: benchmark_pipeline.legacy_extract(scrapers, html), number=5, repeat=3)
+        parsed, _ = benchmark_pipeline.measure(
+            lambda: scrapers.parse_profile(html), number=5, repeat=3)
+        streamed, _ = benchmark_pipeline.measure(
+            lambda: benchmark_pipeline.stream_parse(scrapers, data, http_client.STREAM_CHUNK_SIZE),
+            number=5, repeat=3)
+        self.assertLess(parsed, legacy * MAX_SLOWDOWN)
+        self.assertLess(streamed, legacy * MAX_SLOWDOWN)
+
+    def test_large_page(self):
+        self.assert_not_slower(benchmark_pipeline.inflate(benchmark_pipeline.load_page(), 50))
+
+    def test_large_page_with_late_header(self):
+        self.assert_not_slower(benchmark_pipeline.inflate(benchmark_pipeline.load_page(), 50, late=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import urllib.error
+
+from anki_stubs import addon_module
+from fake_focumon import FakeFocumon
+
+http_client = addon_module("http_client")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.breaker = http_client.CircuitBreaker(threshold=3, cooldown=60)
+
+    def open_breaker(self):
+        for _ in range(self.breaker.threshold):
+            self.breaker.record_failure()
+
+    def wait_out_cooldown(self):
+        self.breaker.opened_at -= self.breaker.cooldown + 1
+
+    def test_opens_after_threshold(self):
+        for _ in range(self.breaker.threshold - 1):
+            self.breaker.record_failure()
+            self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open)
+        self.assertFalse(self.breaker.allow())
+        self.assertAlmostEqual(self.breaker.retry_in(), 60, delta=1)
+
+    def test_single_probe_after_cooldown(self):
+        self.open_breaker()
+        self.wait_out_cooldown()
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+        # A failed probe starts a new cooldown
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+
+        self.wait_out_cooldown()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertFalse(self.breaker.is_open)
+        self.assertTrue(self.breaker.allow())
+
+    def test_probe_without_verdict_is_released(self):
+        self.open_breaker()
+        self.wait_out_cooldown()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.end_probe()
+        self.assertTrue(self.breaker.allow())
+
+
+class TestBreakerAgainstFakeServer(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeFocumon().start()
+        http_client.set_base_url(self.server.url)
+        http_client.breaker.reset()
+
+    def tearDown(self):
+        http_client.set_base_url(None)
+        http_client.breaker.reset()
+        self.server.stop()
+
+    def test_invalid_request_is_not_a_failure(self):
+        for _ in range(http_client.FAILURE_THRESHOLD):
+            with self.assertRaises(urllib.error.URLError):
+                http_client.get("/trainers/bad\nname")
+        self.assertFalse(http_client.breaker.is_open)
+        self.assertEqual(http_client.breaker.failures, 0)
+
+    def test_probe_is_released_after_invalid_request(self):
+        for _ in range(http_client.FAILURE_THRESHOLD):
+            http_client.breaker.record_failure()
+        http_client.breaker.opened_at -= http_client.COOLDOWN_SECONDS + 1
+        with self.assertRaises(urllib.error.URLError):
+            http_client.get("/trainers/bad\nname")
+        self.assertTrue(http_client.breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
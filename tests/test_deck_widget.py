@@ -0,0 +1,212 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import types
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from anki_stubs import addon_module, shared_mw
+from fake_focumon import FakeFocumon
+
+mw = shared_mw()
+deck_widget = addon_module("deck_widget")
+http_client = addon_module("http_client")
+stats_cache = addon_module("stats_cache")
+sprite_store = addon_module("sprite_store")
+ProfileStats = addon_module("models").ProfileStats
+
+
+class _Web:
+    """Records the JS the widget sends to the deck browser."""
+
+    def __init__(self):
+        self.evals = []
+
+    def eval(self, js):
+        self.evals.append(js)
+
+
+class TestDeckWidget(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeFocumon().start()
+        self.config = mw.addonManager.getConfig(__name__)
+        self._config = dict(self.config)
+        self.config.update({
+            "focumon_username": "PeaceMonk",
+            "focumon_base_url": self.server.url,
+            "min_refresh_interval_seconds": 0,
+        })
+
+        self.tmp = tempfile.mkdtemp()
+        self._dirs = (stats_cache.CACHE_DIR, sprite_store.SPRITE_DIR, deck_widget.CSS_DIR)
+        stats_cache.CACHE_DIR = f"{self.tmp}/stats_cache"
+        sprite_store.SPRITE_DIR = f"{self.tmp}/sprites"
+        deck_widget.CSS_DIR = f"{self.tmp}/css"
+        http_client.breaker.reset()
+
+        # Background tasks wait here until finish() runs them
+        self.background = []
+        self._mw = (mw.taskman.run_in_background, mw.pm.night_mode, mw.deckBrowser.web, mw.state)
+        mw.taskman.run_in_background = lambda task, on_done: self.background.append((task, on_done))
+        self.dark = False
+        mw.pm.night_mode = lambda: self.dark
+        mw.deckBrowser.web = self.web = _Web()
+        mw.state = "deckBrowser"
+
+        deck_widget.set_stats(None, None)
+        deck_widget.stats_valid = False
+        deck_widget.needs_refetch = False
+        deck_widget.refresh_in_flight = False
+        deck_widget.rendered_html.clear()
+        deck_widget.stylesheet_urls.clear()
+        scheduler = deck_widget.scheduler
+        scheduler.pending_rerender = scheduler.pending_refetch = scheduler.pending_force = False
+
+    def tearDown(self):
+        for timer in (deck_widget.retry_timer, deck_widget.scheduler.timer, deck_widget.poller.timer):
+            timer.stop()
+        (mw.taskman.run_in_background, mw.pm.night_mode, mw.deckBrowser.web, mw.state) = self._mw
+        self.config.clear()
+        self.config.update(self._config)
+        stats_cache.CACHE_DIR, sprite_store.SPRITE_DIR, deck_widget.CSS_DIR = self._dirs
+        http_client.set_base_url(None)
+        self.server.stop()
+        shutil.rmtree(self.tmp)
+
+    def render(self):
+        content = types.SimpleNamespace(stats="")
+        deck_widget.add_widget_to_deck_browser(None, content)
+        return content.stats
+
+    def finish(self):
+        """Run the oldest background task and hand its result to on_done, like taskman does."""
+        task, on_done = self.background.pop(0)
+        future = Future()
+        try:
+            future.set_result(task())
+        except Exception as e:
+            future.set_exception(e)
+        on_done(future)
+
+    def trainer_requests(self):
+        return self.server.count("/trainers/")
+
+    def test_cold_render_patches_when_fetch_lands(self):
+        html = self.render()
+        self.assertIn('data-state="loading"', html)
+        self.assertEqual(len(self.background), 1)
+        self.assertEqual(self.trainer_requests(), 0)
+
+        self.finish()
+        self.assertTrue(deck_widget.stats_valid)
+        self.assertEqual(deck_widget.current_stats.trainer_level, 36)
+        self.assertIn("LV.36", self.web.evals[-1])
+        self.assertEqual(self.trainer_requests(), 1)
+
+    def test_fresh_disk_entry_needs_no_request(self):
+        stats_cache.save("PeaceMonk", ProfileStats("PeaceMonk", trainer_level=12))
+        html = self.render()
+        self.assertIn("LV.12", html)
+        self.assertTrue(deck_widget.stats_valid)
+        self.assertEqual(self.background, [])
+        self.assertEqual(self.trainer_requests(), 0)
+
+    def test_username_change_during_fetch(self):
+        self.render()
+        self.config["focumon_username"] = "Ash"
+        self.render()
+
+        # PeaceMonk's stats arrive after the switch and are dropped
+        self.finish()
+        self.assertIsNone(deck_widget.current_stats)
+        self.assertFalse(deck_widget.stats_valid)
+        self.assertEqual(self.web.evals, [])
+
+        # ... and a fetch for the trainer now shown has taken its place
+        self.finish()
+        self.assertEqual(deck_widget.current_stats.username, "Ash")
+        self.assertTrue(deck_widget.stats_valid)
+        self.assertEqual(self.background, [])
+
+    def test_invalidation_during_fetch_refetches(self):
+        self.render()
+        deck_widget.invalidate(force=True)
+        deck_widget.scheduler.flush()
+        self.assertEqual(len(self.background), 1)
+
+        # The first result is shown but not trusted; a second fetch follows
+        self.finish()
+        self.assertFalse(deck_widget.stats_valid)
+        self.assertEqual(len(self.background), 1)
+
+        self.finish()
+        self.assertTrue(deck_widget.stats_valid)
+        self.assertFalse(deck_widget.needs_refetch)
+        self.assertEqual(self.trainer_requests(), 2)
+
+    def test_outage_serves_stale_stats_and_retries(self):
+        self.config["stats_cache_ttl_minutes"] = 0
+        stats_cache.save("PeaceMonk", ProfileStats("PeaceMonk", trainer_level=12))
+        time.sleep(0.01)
+        self.server.set_fault("500")
+
+        self.assertIn("LV.12", self.render())
+        self.finish()
+        self.assertTrue(deck_widget.current_stats.stale)
+        self.assertIn('"stale": true', self.web.evals[-1])
+        self.assertIsNotNone(deck_widget.retry_timer.interval)
+
+        # The retry goes through the scheduler like any other invalidation
+        for callback in deck_widget.retry_timer.timeout.callbacks:
+            callback()
+        self.assertTrue(deck_widget.scheduler.pending_refetch)
+
+    def test_theme_change_patches_stylesheet_only(self):
+        stats_cache.save("PeaceMonk", ProfileStats("PeaceMonk", trainer_level=12))
+        light_css = deck_widget.get_stylesheet_url()
+        self.assertIn(light_css, self.render())
+
+        self.dark = True
+        deck_widget.on_theme_change()
+        deck_widget.scheduler.flush()
+        dark_css = deck_widget.get_stylesheet_url()
+        self.assertNotEqual(dark_css, light_css)
+        self.assertEqual(len(self.web.evals), 1)
+        self.assertIn(f'"css": "{dark_css}"', self.web.evals[0])
+        self.assertEqual(self.background, [])
+        self.assertEqual(self.trainer_requests(), 0)
+
+    def test_loading_card_is_swapped_for_stats(self):
+        self.assertIn('data-state="loading"', self.render())
+        self.finish()
+
+        # focumonWidget.update() refuses a loading card, so the eval carries the
+        # rendered stats markup as the outerHTML fallback
+        js = self.web.evals[-1]
+        html = deck_widget.render_widget()
+        self.assertIn('data-state="stats"', html)
+        self.assertIn(f"el.outerHTML = {json.dumps(html)}", js)
+        self.assertIn('"level": "LV.36"', js)
+
+    def test_old_stylesheets_are_removed(self):
+        def stylesheets():
+            return sorted(name.split("-")[1] for name in os.listdir(deck_widget.CSS_DIR))
+
+        for css in ("a {}", "b {}"):
+            with mock.patch.object(deck_widget, "generate_css", return_value=css):
+                deck_widget.get_stylesheet_url()
+        self.assertEqual(stylesheets(), ["light"])
+
+        # The other theme keeps its own file, so toggling back doesn't rewrite it
+        self.dark = True
+        with mock.patch.object(deck_widget, "generate_css", return_value="c {}"):
+            dark_url = deck_widget.get_stylesheet_url()
+        self.assertEqual(stylesheets(), ["dark", "light"])
+        self.assertTrue(os.path.exists(os.path.join(deck_widget.CSS_DIR, dark_url.rsplit("/", 1)[-1])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,12 @@
+import os
 import re
+import sys
 import unittest
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import scrapers
+from models import ProfileStats
+
 # HTML Snippets provided by user
 HTML_STATS = """
 <div class="flex flex-col bg-retro-base-150 dark:bg-base-200 p-2 pb-4 rounded text-sm">
@@ -101,5 +107,83 @@ class TestParsing(unittest.TestCase):
         level = extract_focumon_level(HTML_LEVEL)
         self.assertEqual(level, '17')
 
+class TestParseProfile(unittest.TestCase):
+    def test_single_pass_matches_extractors(self):
+        profile = scrapers.parse_profile(HTML_LEVEL)
+        self.assertEqual(profile.trainer_level, '36')
+        self.assertEqual(profile.focumon_level, '17')
+        self.assertEqual(profile.focumon_name, scrapers.extract_focumon_name(HTML_LEVEL))
+        self.assertEqual(profile.sprite_urls(), scrapers.extract_sprite_urls(HTML_LEVEL))
+
+    def test_focudex(self):
+        html = HTML_LEVEL + '<span>Focudex</span>\n  <span>2/186</span>'
+        self.assertEqual(scrapers.parse_profile(html).focudex_progress, '2/186')
+
+    def test_recorded_page(self):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'trainer_profile.html')
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        profile = scrapers.parse_profile(html)
+        self.assertEqual(profile.trainer_level, '36')
+        self.assertEqual(profile.focudex_progress, '2/186')
+        self.assertEqual(profile.focumon_name, 'Hemling')
+        self.assertEqual(profile.sprite_urls(), scrapers.extract_sprite_urls(html))
+
+    def test_chunked_feed(self):
+        html = HTML_STATS + HTML_LEVEL
+        parser = scrapers.ProfileParser()
+        for i in range(0, len(html), 7):
+            parser.feed(html[i:i + 7])
+        self.assertEqual(parser.close(), scrapers.parse_profile(html))
+
+    def test_chunk_boundaries(self):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'trainer_profile.html')
+        with open(path, encoding='utf-8') as f:
+            html = '<div class="badge">New</div>' + f.read()
+        expected = scrapers.parse_profile(html)
+        self.assertEqual(expected.trainer_level, '36')
+        data = html.encode('utf-8')
+        for size in (1, 13, 1000, 16 * 1024):
+            parser = scrapers.ProfileParser()
+            for i in range(0, len(data), size):
+                if parser.feed_bytes(data[i:i + size]):
+                    break
+            self.assertEqual(parser.close(), expected, size)
+
+    def test_non_matching_markers_at_end_of_page(self):
+        # Markers that never match near the end must not hide the real fields after them
+        html = ('<div class="badge ghost">NEW</div><div class="badge">LV.12</div><div class="badge">LV.5</div>'
+                '<a data-tip="">x</a><a data-tip="Ash"></a><a data-tip="Hemling"></a>')
+        profile = scrapers.parse_profile(html)
+        self.assertEqual((profile.trainer_level, profile.focumon_level), ('12', '5'))
+        self.assertEqual(profile.focumon_name, scrapers.extract_focumon_name(html))
+        self.assertEqual(profile.focumon_name, 'Hemling')
+
+        parser = scrapers.ProfileParser()
+        data = html.encode('utf-8')
+        for i in range(0, len(data), 16):
+            parser.feed_bytes(data[i:i + 16])
+        self.assertEqual(parser.close(), profile)
+
+class TestProfileStats(unittest.TestCase):
+    def test_from_profile(self):
+        html = HTML_LEVEL + '<span>Focudex</span>\n  <span>2/186</span>'
+        stats = ProfileStats.from_profile('ash', scrapers.parse_profile(html))
+        self.assertEqual(stats.trainer_level, 36)
+        self.assertEqual(stats.focumon_level, 17)
+        self.assertEqual((stats.focudex_current, stats.focudex_total), (2, 186))
+        self.assertEqual(stats.focudex_progress, '2/186')
+        self.assertTrue(stats.has_stats)
+
+    def test_json_round_trip(self):
+        stats = ProfileStats('ash', trainer_level=36, focudex_current=2, focudex_total=186)
+        restored = ProfileStats.from_json(stats.to_json())
+        self.assertEqual(restored, stats)
+        self.assertEqual(hash(restored), hash(stats))
+        self.assertNotEqual(stats.mark_stale(), stats)
+
+    def test_username_only(self):
+        self.assertFalse(ProfileStats('ash').has_stats)
+
 if __name__ == '__main__':
     unittest.main()
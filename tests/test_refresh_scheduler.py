@@ -0,0 +1,61 @@
+import time
+import unittest
+
+from anki_stubs import addon_module
+
+refresh_scheduler = addon_module("refresh_scheduler")
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.scheduler = refresh_scheduler.RefreshScheduler(
+            lambda: self.calls.append("rerender"),
+            lambda: self.calls.append("refetch"),
+            min_interval=60,
+        )
+        # Nothing fetched in the last interval
+        self.scheduler.last_fetch = time.monotonic() - 120
+
+    def fire(self):
+        """What QTimer does when the scheduled delay has passed."""
+        for callback in self.scheduler.timer.timeout.callbacks:
+            callback()
+
+    def test_burst_is_coalesced(self):
+        for _ in range(5):
+            self.scheduler.request_refetch()
+        self.scheduler.request_rerender()
+        self.assertEqual(self.scheduler.timer.interval, refresh_scheduler.DEBOUNCE_MS)
+        self.assertEqual(self.calls, [])
+
+        # One refetch covers every request, including the re-render
+        self.fire()
+        self.assertEqual(self.calls, ["refetch"])
+        self.fire()
+        self.assertEqual(self.calls, ["refetch"])
+
+    def test_refetch_is_deferred_by_min_interval(self):
+        self.scheduler.mark_fetched()
+        self.scheduler.request_rerender()
+        self.scheduler.request_refetch()
+
+        # Too soon to fetch: the re-render goes ahead, the fetch waits
+        self.fire()
+        self.assertEqual(self.calls, ["rerender"])
+        self.assertGreater(self.scheduler.timer.interval, 59 * 1000)
+
+        self.scheduler.last_fetch -= 60
+        self.fire()
+        self.assertEqual(self.calls, ["rerender", "refetch"])
+
+    def test_force_bypasses_min_interval(self):
+        self.scheduler.mark_fetched()
+        self.scheduler.request_refetch()
+        self.scheduler.request_refetch(force=True)
+        self.fire()
+        self.assertEqual(self.calls, ["refetch"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from anki_stubs import addon_module
+
+sprite_store = addon_module("sprite_store")
+
+SPRITE = b"x" * 100
+
+
+class TestSpriteStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self._dir = sprite_store.SPRITE_DIR
+        sprite_store.SPRITE_DIR = self.tmp
+
+    def tearDown(self):
+        sprite_store.SPRITE_DIR = self._dir
+        shutil.rmtree(self.tmp)
+
+    def put_aged(self, asset_path, age):
+        """Store a sprite last used `age` seconds ago."""
+        sprite_store.put(asset_path, SPRITE, max_bytes=10 * len(SPRITE))
+        used = time.time() - age
+        os.utime(sprite_store.sprite_path(asset_path), (used, used))
+
+    def test_evicts_least_recently_used(self):
+        self.put_aged("/assets/focumon/battle/001-a.png", 300)
+        self.put_aged("/assets/focumon/battle/002-b.png", 200)
+        self.put_aged("/assets/focumon/battle/003-c.png", 100)
+
+        # Reading a sprite makes it the most recently used
+        self.assertEqual(sprite_store.get("/assets/focumon/battle/001-a.png"), SPRITE)
+
+        sprite_store.evict(2 * len(SPRITE))
+        self.assertEqual(sorted(os.listdir(self.tmp)), [
+            "focumon-battle-001-a.png",
+            "focumon-battle-003-c.png",
+        ])
+
+    def test_put_keeps_the_new_sprite(self):
+        self.put_aged("/assets/focumon/battle/001-a.png", 100)
+        sprite_store.put("/assets/trainer/battle/002-b.png", SPRITE, max_bytes=len(SPRITE))
+        self.assertEqual(os.listdir(self.tmp), ["trainer-battle-002-b.png"])
+
+
+if __name__ == '__main__':
+    unittest.main()
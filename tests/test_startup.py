@@ -0,0 +1,57 @@
+import importlib.util
+import os
+import sys
+import types
+import unittest
+
+import anki_stubs
+
+# Loaded only when the user opens them or the deck browser renders
+DEFERRED = ('deck_widget', 'settings', 'main', 'http_client', 'reload_utils', 'stats_dialog')
+
+
+def load_package(name, config):
+    mw = anki_stubs.install(config)
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(anki_stubs.ADDON_DIR, '__init__.py'),
+        submodule_search_locations=[anki_stubs.ADDON_DIR])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[name] = package
+    spec.loader.exec_module(package)
+    return mw, package
+
+
+class TestLazyStartup(unittest.TestCase):
+    def setUp(self):
+        # load_package() installs its own stubs; put the shared ones back afterwards
+        self._aqt = {name: sys.modules.get(name) for name in anki_stubs.AQT_MODULES}
+
+    def tearDown(self):
+        for name in [m for m in sys.modules if m.split('.')[0] == self.name]:
+            del sys.modules[name]
+        for name, module in self._aqt.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+    def test_startup_defers_imports(self):
+        self.name = 'focumon_startup'
+        mw, package = load_package(self.name, {})
+        for module in DEFERRED:
+            self.assertNotIn(f'{self.name}.{module}', sys.modules)
+        startup = [e for e in package.instrumentation.events() if e['name'] == 'startup']
+        self.assertEqual(len(startup), 1)
+
+    def test_hidden_widget_never_loads(self):
+        self.name = 'focumon_hidden'
+        mw, package = load_package(self.name, {'hide_deck_widget': True})
+        content = types.SimpleNamespace(stats='')
+        for hook in sys.modules['aqt'].gui_hooks.deck_browser_will_render_content:
+            hook(None, content)
+        self.assertNotIn(f'{self.name}.deck_widget', sys.modules)
+        self.assertEqual(content.stats, '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import unittest
+
+from anki_stubs import addon_module
+
+stats_poller = addon_module("stats_poller")
+
+
+class TestStatsPoller(unittest.TestCase):
+    def setUp(self):
+        self.interval = 600
+        self.paused = False
+        self.last_fetch = 0.0
+        self.pending = []
+        self.poller = stats_poller.StatsPoller(
+            self.fetch,
+            lambda: self.interval,
+            lambda: self.paused,
+            lambda: self.last_fetch,
+        )
+
+    def fetch(self, on_complete):
+        self.pending.append(on_complete)
+        return True
+
+    def delay(self):
+        """Seconds until the poller's timer fires."""
+        return self.poller.timer.interval / 1000
+
+    def test_backoff_is_capped(self):
+        self.poller.reconfigure()
+        self.assertEqual(self.delay(), self.interval)
+
+        for failures in range(1, 8):
+            self.poller.tick()
+            self.pending.pop()(False)
+            factor = min(2 ** failures, stats_poller.MAX_BACKOFF_FACTOR)
+            self.assertEqual(self.delay(), self.interval * factor)
+
+        # One success and the normal interval is back
+        self.poller.tick()
+        self.pending.pop()(True)
+        self.assertEqual(self.delay(), self.interval)
+
+    def test_paused_while_reviewing(self):
+        self.paused = True
+        self.poller.tick()
+        self.assertEqual(self.pending, [])
+        self.assertEqual(self.delay(), stats_poller.PAUSE_RECHECK_SECONDS)
+
+        self.paused = False
+        self.poller.tick()
+        self.assertEqual(len(self.pending), 1)
+
+    def test_recent_fetch_postpones_poll(self):
+        self.last_fetch = time.monotonic() - 100
+        self.poller.tick()
+        self.assertEqual(self.pending, [])
+        self.assertAlmostEqual(self.delay(), self.interval - 100, delta=1)
+
+    def test_disabled(self):
+        self.interval = 0
+        self.poller.reconfigure()
+        self.poller.tick()
+        self.assertEqual(self.pending, [])
+        self.assertIsNone(self.poller.timer.interval)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import wait
+
+from anki_stubs import addon_module
+from fake_focumon import FakeFocumon
+
+http_client = addon_module("http_client")
+stats_cache = addon_module("stats_cache")
+sprite_store = addon_module("sprite_store")
+stats_service = addon_module("stats_service")
+ProfileStats = addon_module("models").ProfileStats
+
+PER_PROFILE = {
+    "per_profile_username": True,
+    "focumon_username": "Shared",
+    "profile_usernames": {"Alice": " PeaceMonk ", "Bob": "peacemonk", "Carol": "Ash", "Dave": ""},
+}
+
+
+class TestUsernames(unittest.TestCase):
+    def test_shared_username(self):
+        config = {"focumon_username": " PeaceMonk ", "profile_usernames": {"Alice": "Ash"}}
+        self.assertEqual(stats_service.get_username(config, "Alice"), "PeaceMonk")
+        self.assertEqual(stats_service.get_username(config, "Anyone"), "PeaceMonk")
+        self.assertEqual(stats_service.get_all_usernames(config), ["PeaceMonk"])
+
+    def test_mapped_profiles(self):
+        self.assertEqual(stats_service.get_username(PER_PROFILE, "Alice"), "PeaceMonk")
+        self.assertEqual(stats_service.get_username(PER_PROFILE, "Carol"), "Ash")
+
+    def test_unmapped_profile_has_no_username(self):
+        # The shared username is not a fallback once usernames are per profile
+        self.assertEqual(stats_service.get_username(PER_PROFILE, "Dave"), "")
+        self.assertEqual(stats_service.get_username(PER_PROFILE, "Erin"), "")
+        self.assertEqual(stats_service.get_username(PER_PROFILE, None), "")
+
+    def test_all_usernames_dedup_case_insensitively(self):
+        self.assertEqual(stats_service.get_all_usernames(PER_PROFILE), ["PeaceMonk", "Ash"])
+
+    def test_no_config(self):
+        self.assertEqual(stats_service.get_username(None, "Alice"), "")
+        self.assertEqual(stats_service.get_all_usernames({}), [])
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeFocumon().start()
+        self.config = {"focumon_base_url": self.server.url}
+        self.tmp = tempfile.mkdtemp()
+        self._dirs = (stats_cache.CACHE_DIR, sprite_store.SPRITE_DIR)
+        stats_cache.CACHE_DIR = f"{self.tmp}/stats_cache"
+        sprite_store.SPRITE_DIR = f"{self.tmp}/sprites"
+        http_client.breaker.reset()
+
+    def tearDown(self):
+        http_client.set_base_url(None)
+        self.server.stop()
+        stats_cache.CACHE_DIR, sprite_store.SPRITE_DIR = self._dirs
+        shutil.rmtree(self.tmp)
+
+    def test_fresh_entries_are_skipped(self):
+        stats_cache.save("Ash", ProfileStats("Ash", trainer_level=3))
+        futures = stats_service.prefetch(["PeaceMonk", "Ash", "Misty"], self.config)
+        wait(futures)
+        self.assertEqual(len(futures), 2)
+        trainers = sorted(path for path in self.server.requests if path.startswith("/trainers/"))
+        self.assertEqual(trainers, ["/trainers/Misty", "/trainers/PeaceMonk"])
+        self.assertTrue(stats_cache.is_fresh("Misty", 60))
+
+        # Everything is fresh now, so a second prefetch sends nothing
+        self.assertEqual(stats_service.prefetch(["PeaceMonk", "Ash", "Misty"], self.config), [])
+        self.assertEqual(self.server.count("/trainers/"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+from aqt import mw
+from aqt.qt import *
+from aqt.utils import showInfo, tooltip
+import time
+
+from . import instrumentation
+
+# Most recent events listed below the summary
+RECENT_EVENTS = 100
+
+
+class TimingsDialog(QDialog):
+    """Shows the instrumentation ring buffer: a per-stage summary and the latest events."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent or mw)
+        self.setWindowTitle("Focumon Timings")
+        self.resize(720, 560)
+        self.setup_ui()
+        self.load_events()
+
+    def setup_ui(self):
+        is_dark = mw.pm.night_mode() if hasattr(mw.pm, 'night_mode') else False
+        bg_color = "#242424" if is_dark else "#FAF8F2"
+        text_color = "#FAF8F2" if is_dark else "#242424"
+        panel_bg = "#202020" if is_dark else "#E3E2DC"
+        accent_color = "#FFDD19"
+
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {bg_color};
+            }}
+            QLabel {{
+                color: {text_color};
+                font-weight: 600;
+            }}
+            QTableWidget, QPlainTextEdit {{
+                background-color: {panel_bg};
+                color: {text_color};
+                border: none;
+                border-radius: 6px;
+            }}
+            QPushButton {{
+                background-color: {accent_color};
+                color: #000000;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-weight: 600;
+            }}
+            QPushButton:hover {{
+                background-color: #FFE84D;
+            }}
+        """)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(8)
+
+        layout.addWidget(QLabel("Per stage (slowest first)"))
+        self.summary_table = QTableWidget(0, 5)
+        self.summary_table.setHorizontalHeaderLabels(["Stage", "Count", "Mean ms", "Max ms", "Last ms"])
+        self.summary_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.summary_table.verticalHeader().setVisible(False)
+        self.summary_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.summary_table, 3)
+
+        layout.addWidget(QLabel(f"Latest {RECENT_EVENTS} events"))
+        self.events_view = QPlainTextEdit()
+        self.events_view.setReadOnly(True)
+        self.events_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.events_view, 2)
+
+        btn_layout = QHBoxLayout()
+        for label, slot in (
+            ("Refresh", self.load_events),
+            ("Clear", self.clear_events),
+            ("Export JSON...", self.export_json),
+        ):
+            button = QPushButton(label)
+            button.setCursor(Qt.CursorShape.PointingHandCursor)
+            button.clicked.connect(slot)
+            btn_layout.addWidget(button)
+        btn_layout.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+    def load_events(self):
+        rows = instrumentation.summary()
+        self.summary_table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            values = (row["name"], row["count"], row["mean_ms"], row["max_ms"], row["last_ms"])
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(f"{value:.1f}" if isinstance(value, float) else str(value))
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.summary_table.setItem(i, column, item)
+
+        lines = []
+        for event in reversed(instrumentation.events()[-RECENT_EVENTS:]):
+            clock = time.strftime("%H:%M:%S", time.localtime(event["at"]))
+            details = " ".join(f"{key}={value}" for key, value in event.get("details", {}).items())
+            lines.append(f"{clock}  {event['ms']:>9.1f} ms  {event['name']:<28} {details}")
+        self.events_view.setPlainText("\n".join(lines) or "No timings recorded yet.")
+
+    def clear_events(self):
+        instrumentation.clear()
+        self.load_events()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Timings", "focumon-timings.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            instrumentation.export_json(path)
+        except OSError as e:
+            showInfo(f"Could not export timings: {e}")
+            return
+        tooltip(f"Exported {len(instrumentation.events())} events", parent=self)